@@ -1,15 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 import logging
-from ...services.qa_service import qa_service
 from ..models.request import QuestionRequest, QuestionResponse
 
 router = APIRouter()
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 @router.post("/question", response_model=QuestionResponse)
-async def ask_question(request: QuestionRequest):
+async def ask_question(request: QuestionRequest, http_request: Request):
     """
     Ask a question about Turkish Criminal Law.
 
@@ -17,7 +15,19 @@ async def ask_question(request: QuestionRequest):
     - **metadata_filter**: Optional filters for specific sections of law
     - **n_results**: Number of source documents to return (1-10)
     """
-    logger.info(f"Received question request: {request}")
+    logger.info("Received question request: %s", request)
+    if http_request.app.state.init_error is not None:
+        raise HTTPException(
+            status_code=500,
+            detail="Service initialization failed"
+        )
+    if not http_request.app.state.is_initialized:
+        raise HTTPException(
+            status_code=503,
+            detail="Service is still initializing"
+        )
+
+    qa_service = http_request.app.state.qa_service
     try:
         result = await qa_service.get_answer(
             question=request.question,
@@ -27,7 +37,7 @@ async def ask_question(request: QuestionRequest):
         logger.info("Successfully generated answer")
         return result
     except Exception as e:
-        logger.error(f"Error processing question: {str(e)}")
+        logger.error("Error processing question: %s", e)
         raise HTTPException(
             status_code=500,
             detail=str(e)
@@ -1,14 +1,18 @@
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class QuestionRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     question: str = Field(..., min_length=1, max_length=1000)
     metadata_filter: Optional[Dict[str, str]] = None
     n_results: Optional[int] = Field(default=5, ge=1, le=10)
 
 
 class SearchResult(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     content: str
     metadata: Dict[str, Any]
@@ -16,6 +20,8 @@ class SearchResult(BaseModel):
 
 
 class QuestionResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     answer: str
     confidence_score: Optional[float] = None
     sources: list[SearchResult]
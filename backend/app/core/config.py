@@ -1,17 +1,21 @@
-from typing import Optional
-from pydantic_settings import BaseSettings
+from typing import ClassVar, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
-from pydantic import validator
+from pydantic import model_validator
 
 
 class Settings(BaseSettings):
-    # API Configuration
-    API_V1_STR: str = "/api/v1"
-    PROJECT_NAME: str = "Turkish Legal AI"
+    # API Configuration (constants, not read from the environment)
+    API_V1_STR: ClassVar[str] = "/api/v1"
+    PROJECT_NAME: ClassVar[str] = "Turkish Legal AI"
 
     # CORS Configuration
-    BACKEND_CORS_ORIGINS: list[str] = ["http://localhost:3000",
-                                       "http://localhost:8000", "http://localhost", "http://localhost:80"]
+    BACKEND_CORS_ORIGINS: tuple[str, ...] = (
+        "http://localhost:3000",
+        "http://localhost:8000",
+        "http://localhost",
+        "http://localhost:80",
+    )
 
     # OpenAI Configuration
     OPENAI_API_KEY: Optional[str] = None
@@ -26,19 +30,38 @@ class Settings(BaseSettings):
     # Vector Store Configuration
     COLLECTION_NAME: str = "turkish_criminal_law"
 
-    class Config:
-        case_sensitive = True
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        extra = "ignore"
+    # Answer Cache Configuration (0 disables caching)
+    ANSWER_CACHE_SIZE: int = 1024
 
-    @validator("OPENAI_API_KEY", "HUGGINGFACE_TOKEN")
-    def validate_required_env_vars(cls, v: Optional[str]) -> str:
-        if not v:
-            raise ValueError(f"Environment variable must be provided")
-        return v
+    # Worker threads for blocking retrieval and LLM calls (unset: 2 per CPU)
+    QA_WORKERS: Optional[int] = None
+
+    model_config = SettingsConfigDict(
+        case_sensitive=True,
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+        frozen=True,
+    )
+
+    @model_validator(mode="after")
+    def validate_required_env_vars(self) -> "Settings":
+        # Unset keys keep their None default; only explicitly empty values
+        # are rejected, as the previous per-field validator did
+        for name in ("OPENAI_API_KEY", "HUGGINGFACE_TOKEN"):
+            if getattr(self, name) == "":
+                raise ValueError(f"Environment variable {name} must be provided")
+        if self.QA_WORKERS is not None and self.QA_WORKERS < 1:
+            raise ValueError("QA_WORKERS must be at least 1")
+        return self
 
 
 @lru_cache()
 def get_settings() -> Settings:
     return Settings()
+
+
+def clear_settings_cache() -> None:
+    """Drop the cached Settings so the next get_settings() re-reads the environment."""
+    get_settings.cache_clear()
+
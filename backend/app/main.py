@@ -1,11 +1,26 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import logging
+import logging.config
 from .core.config import get_settings
 from .api.endpoints import qa
+from .services.qa_service import get_qa_service
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Set up logging once for the whole application; modules only create loggers
+LOGGING_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "default": {"format": "%(levelname)s:%(name)s:%(message)s"}
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "default"}
+    },
+    "root": {"level": "INFO", "handlers": ["console"]},
+}
+logging.config.dictConfig(LOGGING_CONFIG)
 logger = logging.getLogger(__name__)
 
 # Get settings
@@ -19,10 +34,11 @@ app = FastAPI(
     redoc_url=f"{settings.API_V1_STR}/redoc"
 )
 
-# Set up CORS
+# Set up CORS; Starlette checks `origin in allow_origins` on every request,
+# so hand it a frozenset for constant-time lookups
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.BACKEND_CORS_ORIGINS,
+    allow_origins=frozenset(settings.BACKEND_CORS_ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -31,25 +47,61 @@ app.add_middleware(
 # Include routers
 app.include_router(qa.router, prefix=settings.API_V1_STR)
 
-# Application state to track initialization
+# Application state to track initialization; init_error holds the failure
+# message if the QA service could not be built
 app.state.is_initialized = False
+app.state.init_error = None
+
+
+async def initialize_qa_service():
+    """Build the QA service off the event loop and mark the app as ready."""
+    try:
+        qa_service = await asyncio.to_thread(get_qa_service)
+        await asyncio.to_thread(qa_service.warm_up)
+        app.state.qa_service = qa_service
+    except Exception as e:
+        logger.exception("Failed to initialize the QA service")
+        app.state.init_error = str(e) or e.__class__.__name__
+        return
+    app.state.is_initialized = True
+    logger.info("Application startup complete")
 
 
 @app.on_event("startup")
 async def startup_event():
     logger.info("Starting up the application...")
-    # Mark as initialized - in production you might want to add more checks
-    app.state.is_initialized = True
-    logger.info("Application startup complete")
+    # Build the QA service (embedding model, vector stores, LLM client) once
+    # and share it across requests via app.state. Loading runs in the
+    # background so /health can report "initializing" in the meantime.
+    app.state.init_task = asyncio.create_task(initialize_qa_service())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if getattr(app.state, "qa_service", None) is not None:
+        app.state.qa_service.shutdown()
+
+
+# Health responses are static, so render their bodies once instead of per probe
+HEALTHY_RESPONSE = JSONResponse(content={"status": "healthy"})
+INITIALIZING_RESPONSE = JSONResponse(
+    content={"status": "initializing"}, status_code=503)
 
 
 @app.get("/health")
 async def health_check():
     """Enhanced health check endpoint that ensures the application is fully initialized."""
+    if app.state.init_error is not None:
+        logger.error("Health check failed: Application failed to initialize")
+        return JSONResponse(
+            content={"status": "initialization_failed",
+                     "detail": app.state.init_error},
+            status_code=500)
+
     if not app.state.is_initialized:
         logger.warning(
             "Health check failed: Application not fully initialized")
-        return {"status": "initializing"}, 503
+        return INITIALIZING_RESPONSE
 
-    logger.info("Health check passed: Application is healthy")
-    return {"status": "healthy"}
+    logger.debug("Health check passed: Application is healthy")
+    return HEALTHY_RESPONSE
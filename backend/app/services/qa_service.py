@@ -1,27 +1,105 @@
+import asyncio
+import hashlib
+import os
+import threading
 import time
-from typing import Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional
 
-from langchain_openai import ChatOpenAI
 from ..core.config import get_settings
-from src.rag import TurkishLegalRAG, LegalQAChain
+
+
+def _limit_docs(docs: List[Dict], n: int) -> List[Dict]:
+    """Keep the first n articles and the first n legal terms, in order."""
+    counts: Dict[bool, int] = {True: 0, False: 0}
+    limited = []
+    for doc in docs:
+        is_term = doc["metadata"].get("type") == "legal_term"
+        if counts[is_term] < n:
+            counts[is_term] += 1
+            limited.append(doc)
+    return limited
 
 
 class QAService:
-    def __init__(self):
+    def __init__(self, rag_system: Any = None, qa_chain: Any = None):
+        """Build the RAG stack, or use the given rag_system and qa_chain."""
         self.settings = get_settings()
-        self.rag_system = TurkishLegalRAG(
-            law_json_path="data/processed/processed_law.json",
-            terms_json_path="tools/legal-terminology-dict/output/legal_terms.json",
-            collection_name=self.settings.COLLECTION_NAME,
-            embedding_model=self.settings.EMBEDDING_MODEL
-        )
 
-        self.llm = ChatOpenAI(
-            model_name=self.settings.LLM_MODEL,
-            temperature=0
+        # The RAG stack pulls in torch, sentence-transformers and chromadb;
+        # import it here so loading the app (and /health) does not pay for it
+        if rag_system is None:
+            from src.rag import TurkishLegalRAG
+            rag_system = TurkishLegalRAG(
+                law_json_path="data/processed/processed_law.json",
+                terms_json_path="tools/legal-terminology-dict/output/legal_terms.json",
+                collection_name=self.settings.COLLECTION_NAME,
+                embedding_model=self.settings.EMBEDDING_MODEL
+            )
+        self.rag_system = rag_system
+
+        if qa_chain is None:
+            from langchain_openai import ChatOpenAI
+            from src.rag import LegalQAChain
+            qa_chain = LegalQAChain(
+                self.rag_system,
+                ChatOpenAI(model_name=self.settings.LLM_MODEL, temperature=0)
+            )
+        self.qa_chain = qa_chain
+        self.llm = qa_chain.llm
+
+        # Retrieval (embedding + Chroma) and the OpenAI call are blocking, so
+        # they run on worker threads to keep the event loop free
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.settings.QA_WORKERS or (os.cpu_count() or 1) * 2,
+            thread_name_prefix="qa-worker"
         )
 
-        self.qa_chain = LegalQAChain(self.rag_system, self.llm)
+        # LRU cache of recent answers keyed by normalized question, filter
+        # and n_results; repeated questions skip retrieval and the LLM call
+        self._answer_cache: "OrderedDict[bytes, Dict]" = OrderedDict()
+        self._answer_cache_size = self.settings.ANSWER_CACHE_SIZE
+        self._answer_cache_lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(
+        question: str,
+        metadata_filter: Optional[Dict[str, str]],
+        n_results: int
+    ) -> bytes:
+        """Build a compact cache key for a question request."""
+        normalized = "\x1f".join([
+            question.strip().lower(),
+            repr(sorted((metadata_filter or {}).items())),
+            str(n_results)
+        ])
+        return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+    def _get_cached_answer(self, key: bytes) -> Optional[Dict]:
+        with self._answer_cache_lock:
+            result = self._answer_cache.get(key)
+            if result is not None:
+                self._answer_cache.move_to_end(key)
+            return result
+
+    def _cache_answer(self, key: bytes, result: Dict) -> None:
+        if self._answer_cache_size <= 0:
+            return
+        with self._answer_cache_lock:
+            self._answer_cache[key] = result
+            self._answer_cache.move_to_end(key)
+            while len(self._answer_cache) > self._answer_cache_size:
+                self._answer_cache.popitem(last=False)
+
+    def warm_up(self) -> None:
+        """Run one query embedding so the first request skips lazy model setup."""
+        self.rag_system.embed_query("warm-up")
+
+    def shutdown(self) -> None:
+        """Release the worker threads used for blocking RAG calls."""
+        self.executor.shutdown(wait=False)
 
     async def get_answer(
         self,
@@ -29,35 +107,68 @@ class QAService:
         metadata_filter: Optional[Dict[str, str]] = None,
         n_results: int = 5
     ) -> Dict:
-        start_time = time.time()
+        start_time = time.perf_counter()
+
+        cache_key = self._cache_key(question, metadata_filter, n_results)
+        cached = self._get_cached_answer(cache_key)
+        if cached is not None:
+            return {**cached, "processing_time": time.perf_counter() - start_time}
+
+        loop = asyncio.get_running_loop()
 
         try:
-            # Get answer from QA chain
-            answer = self.qa_chain.run(
-                question=question,
-                metadata_filter=metadata_filter
+            # Retrieve once for both uses: n_results only sizes the sources
+            # returned to the client, while the QA chain always answers from
+            # its own n_results documents
+            chain_n_results = self.qa_chain.n_results
+            docs = await loop.run_in_executor(
+                self.executor,
+                partial(
+                    self.rag_system.retrieve,
+                    query=question,
+                    n_results=max(n_results, chain_n_results),
+                    metadata_filter=metadata_filter
+                )
             )
+            sources = _limit_docs(docs, n_results)
 
-            # Get sources (including both articles and terms)
-            sources = self.rag_system.retrieve(
-                query=question,
-                n_results=n_results,
-                metadata_filter=metadata_filter
+            # Get answer from QA chain
+            answer = await loop.run_in_executor(
+                self.executor,
+                partial(
+                    self.qa_chain.run,
+                    question=question,
+                    metadata_filter=metadata_filter,
+                    retrieved_docs=_limit_docs(docs, chain_n_results)
+                )
             )
 
             # Calculate processing time
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
 
-            return {
+            result = {
                 "answer": answer,
                 "confidence_score": 0.8,  # TODO: Implement confidence scoring
                 "sources": sources,
                 "processing_time": processing_time
             }
+            if not self.qa_chain.is_error_answer(answer):
+                self._cache_answer(cache_key, result)
+            return result
 
         except Exception as e:
             raise Exception(f"Error processing question: {str(e)}")
 
 
-# Create singleton instance
-qa_service = QAService()
+_qa_service: Optional[QAService] = None
+_qa_service_lock = threading.Lock()
+
+
+def get_qa_service() -> QAService:
+    """Return the process-wide QAService, building it on first use."""
+    global _qa_service
+    if _qa_service is None:
+        with _qa_service_lock:
+            if _qa_service is None:
+                _qa_service = QAService()
+    return _qa_service
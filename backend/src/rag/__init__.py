@@ -1,11 +1,34 @@
 """
 Turkish Legal RAG system package.
+
+Public classes are resolved lazily on first attribute access (PEP 562), so
+importing a lightweight submodule such as ``src.rag.prompts`` does not pull
+in chromadb, sentence-transformers or the OpenAI client.
 """
 
-from .embeddings import get_embedding_function
-from .rag_system import TurkishLegalRAG
-from .qa_chain import LegalQAChain
-from .legal_terms import LegalTerminology
+import importlib
+
+_EXPORTS = {
+    'TurkishLegalRAG': '.rag_system',
+    'LegalQAChain': '.qa_chain',
+    'get_embedding_function': '.embeddings',
+    'LegalTerminology': '.legal_terms',
+    'get_legal_terminology': '.legal_terms',
+}
 
 __all__ = ['TurkishLegalRAG', 'LegalQAChain',
-           'get_embedding_function', 'LegalTerminology']
+           'get_embedding_function', 'LegalTerminology',
+           'get_legal_terminology']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
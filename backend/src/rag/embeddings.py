@@ -3,10 +3,12 @@ Embedding functionality for the Turkish Legal RAG system.
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
 from chromadb.utils import embedding_functions
 
 
+@lru_cache(maxsize=4)
 def get_embedding_function(
     model_name: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
     hf_token: Optional[str] = None
@@ -14,6 +16,9 @@ def get_embedding_function(
     """
     Create an embedding function using the specified model.
 
+    Embedding functions are cached per (model_name, hf_token), so the law,
+    terms and retriever collections share one loaded model.
+
     Args:
         model_name: Name of the sentence transformer model to use
         hf_token: Optional Hugging Face token for better performance
@@ -2,12 +2,16 @@
 Module for managing and integrating legal terminology with the RAG system.
 """
 
-import json
+import hashlib
 import os
-from typing import Dict, List, Optional
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import chromadb
-from chromadb.utils import embedding_functions
+import orjson
 from chromadb.errors import InvalidCollectionException
+from .embeddings import get_embedding_function
 
 # Create persistent storage directory if it doesn't exist
 CHROMA_DB_DIR = os.path.join(os.path.dirname(
@@ -23,39 +27,79 @@ class LegalTerminology:
         terms_json_path: str,
         collection_name: str = "turkish_legal_terms",
         embedding_model: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
-        hf_token: Optional[str] = None
+        hf_token: Optional[str] = None,
+        cache_size: int = 1024
     ):
         """Initialize the legal terminology system."""
-        self.terms_data = self._load_terms(terms_json_path)
+        # Fingerprint the terms file and model; the JSON is only parsed when
+        # the stored collection is missing or was built from other inputs
+        with open(terms_json_path, 'rb') as f:
+            terms_bytes = f.read()
+        fingerprint = hashlib.blake2b(
+            embedding_model.encode('utf-8') + b"\0" + terms_bytes,
+            digest_size=16
+        ).hexdigest()
+        self._terms_json_path = terms_json_path
+        self._terms_data: Optional[Dict[str, str]] = None
+
+        # LRU cache of lookup results keyed by (context, n_results); the same
+        # articles come back for many questions, so their term lookups repeat
+        self._terms_cache: "OrderedDict[Tuple[str, int], List[Dict]]" = OrderedDict()
+        self._terms_cache_size = cache_size
+        self._terms_cache_lock = threading.Lock()
 
         # Initialize embedding function
-        self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
+        self.embedding_function = get_embedding_function(
             model_name=embedding_model,
-            token=hf_token
+            hf_token=hf_token
         )
 
         # Initialize Chroma client with persistent storage
         self.chroma_client = chromadb.PersistentClient(path=CHROMA_DB_DIR)
 
+        self.collection = None
         try:
-            self.collection = self.chroma_client.get_collection(
+            collection = self.chroma_client.get_collection(
                 name=collection_name,
                 embedding_function=self.embedding_function
             )
-            print(f"Using existing legal terms collection: {collection_name}")
+            if (collection.metadata or {}).get("terms_fingerprint") == fingerprint:
+                self.collection = collection
+                print(f"Using existing legal terms collection: {collection_name}")
+            else:
+                print(f"Legal terms collection is out of date: {collection_name}")
+                self.chroma_client.delete_collection(name=collection_name)
         except (ValueError, InvalidCollectionException):
+            pass
+
+        if self.collection is None:
             print(f"Creating new legal terms collection: {collection_name}")
             self.collection = self.chroma_client.create_collection(
                 name=collection_name,
                 embedding_function=self.embedding_function,
-                metadata={"description": "Turkish Legal Terms Embeddings"}
+                metadata={
+                    "description": "Turkish Legal Terms Embeddings",
+                    "terms_fingerprint": fingerprint
+                }
             )
+            self._terms_data = self._load_terms(terms_bytes)
             self._initialize_vector_store()
 
-    def _load_terms(self, json_path: str) -> Dict[str, str]:
-        """Load legal terms from JSON file."""
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    @property
+    def terms_data(self) -> Dict[str, str]:
+        """Legal terms and their definitions.
+
+        Parsed while building the collection, or from the terms file on
+        first access when an up-to-date collection was reused.
+        """
+        if self._terms_data is None:
+            with open(self._terms_json_path, 'rb') as f:
+                self._terms_data = self._load_terms(f.read())
+        return self._terms_data
+
+    def _load_terms(self, terms_bytes: bytes) -> Dict[str, str]:
+        """Parse legal terms from the raw JSON file contents."""
+        return orjson.loads(terms_bytes)
 
     def _initialize_vector_store(self):
         """Initialize the vector store with legal terms and their definitions."""
@@ -75,8 +119,9 @@ class LegalTerminology:
                 "type": "legal_term"
             })
 
-        # Add documents to collection in batches
-        batch_size = 100
+        # Add documents to collection in batches; each add() encodes its
+        # whole batch in one embedding call, same size as the law articles
+        batch_size = 256
         for i in range(0, len(documents), batch_size):
             end_idx = min(i + batch_size, len(documents))
             self.collection.add(
@@ -85,29 +130,119 @@ class LegalTerminology:
                 metadatas=metadatas[i:end_idx]
             )
 
-    def get_relevant_terms(self, context: str, n_results: int = 5) -> List[Dict]:
+    def get_relevant_terms(
+        self,
+        context: str,
+        n_results: int = 5,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict]:
         """
         Retrieve relevant legal terms based on the given context.
 
         Args:
             context: The text to find relevant terms for (can be a question or article text)
             n_results: Number of relevant terms to retrieve
+            query_embedding: Optional precomputed embedding of the context
 
         Returns:
             List of dictionaries containing term information
         """
+        query_embeddings = None if query_embedding is None else [
+            query_embedding]
+        return self.get_relevant_terms_batch(
+            [context], n_results=n_results, query_embeddings=query_embeddings)[0]
+
+    def get_relevant_terms_batch(
+        self,
+        contexts: List[str],
+        n_results: int = 5,
+        query_embeddings: Optional[List[Optional[List[float]]]] = None
+    ) -> List[List[Dict]]:
+        """
+        Retrieve relevant legal terms for several contexts with a single query.
+
+        Args:
+            contexts: The texts to find relevant terms for
+            n_results: Number of relevant terms to retrieve per context
+            query_embeddings: Optional precomputed embeddings, one per context;
+                entries may be None to have that context encoded here
+
+        Returns:
+            One list of term dictionaries per context, in input order
+        """
+        if query_embeddings is None:
+            query_embeddings = [None] * len(contexts)
+
+        batch = [self._get_cached_terms((context, n_results))
+                 for context in contexts]
+        missing = [i for i, terms in enumerate(batch) if terms is None]
+        if not missing:
+            return batch
+
+        # Encode only the uncached contexts that came without an embedding
+        to_embed = [i for i in missing if query_embeddings[i] is None]
+        embedded = {}
+        if to_embed:
+            embedded = dict(zip(to_embed, self.embedding_function(
+                [contexts[i] for i in to_embed])))
+
         results = self.collection.query(
-            query_texts=[context],
+            query_embeddings=[
+                embedded[i] if i in embedded else query_embeddings[i]
+                for i in missing
+            ],
             n_results=n_results
         )
 
-        terms = []
-        for idx, doc in enumerate(results['documents'][0]):
-            metadata = results['metadatas'][0][idx]
-            terms.append({
-                "term": metadata["term"],
-                "definition": doc.split("[DEFINITION]")[1].strip(),
-                "distance": results['distances'][0][idx] if 'distances' in results else None
-            })
-
-        return terms
+        distances = results.get('distances')
+        for row, i in enumerate(missing):
+            metadatas = results['metadatas'][row]
+            terms = []
+            for idx, doc in enumerate(results['documents'][row]):
+                terms.append({
+                    "term": metadatas[idx]["term"],
+                    "definition": doc.split("[DEFINITION]")[1].strip(),
+                    "distance": distances[row][idx] if distances else None
+                })
+            self._cache_terms((contexts[i], n_results), terms)
+            batch[i] = terms
+
+        return batch
+
+    def _get_cached_terms(self, key: Tuple[str, int]) -> Optional[List[Dict]]:
+        with self._terms_cache_lock:
+            terms = self._terms_cache.get(key)
+            if terms is not None:
+                self._terms_cache.move_to_end(key)
+            return terms
+
+    def _cache_terms(self, key: Tuple[str, int], terms: List[Dict]) -> None:
+        if self._terms_cache_size <= 0:
+            return
+        with self._terms_cache_lock:
+            self._terms_cache[key] = terms
+            self._terms_cache.move_to_end(key)
+            while len(self._terms_cache) > self._terms_cache_size:
+                self._terms_cache.popitem(last=False)
+
+
+@lru_cache(maxsize=None)
+def get_legal_terminology(
+    terms_json_path: str,
+    collection_name: str = "turkish_legal_terms",
+    embedding_model: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
+    hf_token: Optional[str] = None
+) -> LegalTerminology:
+    """
+    Return a shared LegalTerminology for the given terms file and model.
+
+    Instances are cached per argument combination, so every RAG system in the
+    process reuses the same collection handle and lookup cache instead of
+    re-reading and fingerprinting the terms file.
+    """
+    return LegalTerminology(
+        terms_json_path=terms_json_path,
+        collection_name=collection_name,
+        embedding_model=embedding_model,
+        hf_token=hf_token
+    )
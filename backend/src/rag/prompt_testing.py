@@ -1,6 +1,10 @@
 """Script for testing and evaluating different prompt templates."""
+import asyncio
+import logging
+import logging.handlers
 import os
-from typing import List, Dict
+import sys
+from typing import Any, List, Dict
 from langchain_openai import ChatOpenAI
 from .prompts import (
     BasicLegalPrompt,
@@ -10,6 +14,8 @@ from .prompts import (
 )
 from .rag_system import TurkishLegalRAG
 
+logger = logging.getLogger(__name__)
+
 # Get the absolute path to the data directory
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "..", "data")
@@ -66,12 +72,18 @@ def get_test_questions() -> List[Dict[str, str]]:
     ]
 
 
-def test_prompts(
+async def test_prompts(
     rag_system: TurkishLegalRAG,
     llm: ChatOpenAI,
-    evaluator: PromptEvaluator
+    evaluator: PromptEvaluator,
+    max_concurrency: int = 5
 ) -> None:
-    """Test different prompt templates and evaluate their performance."""
+    """Test different prompt templates and evaluate their performance.
+
+    LLM calls for every (prompt, question) pair are sent as one batch that
+    runs at most ``max_concurrency`` requests at a time, to stay within
+    provider rate limits.
+    """
     # Initialize prompt templates
     prompts = {
         "basic": BasicLegalPrompt(),
@@ -82,109 +94,155 @@ def test_prompts(
     # Get test questions
     test_questions = get_test_questions()
 
-    # Test each prompt template
-    for prompt_name, prompt in prompts.items():
-        print(f"\nTesting {prompt_name} prompt template...")
+    # Retrieval only depends on the question, so run it once per question
+    # (off the event loop) and share the context across prompt templates
+    async def build_context(question: str) -> str:
+        context = await asyncio.to_thread(rag_system.retrieve, question)
+        return rag_system.format_context(context)
 
-        for test_case in test_questions:
-            question = test_case["question"]
-            expected_structure = test_case["expected_structure"]
-            metadata = test_case.get("metadata", {})
+    questions = [test_case["question"] for test_case in test_questions]
+    contexts = dict(zip(questions, await asyncio.gather(
+        *(build_context(question) for question in questions))))
+
+    def record_case(prompt_name: str, test_case: Dict, response: Any) -> None:
+        question = test_case["question"]
+        expected_structure = test_case["expected_structure"]
+        metadata = test_case.get("metadata", {})
+
+        try:
+            if isinstance(response, Exception):
+                raise response
+            answer = response.content if hasattr(
+                response, 'content') else str(response)
 
-            print(f"\nProcessing question: {question}")
-            print(f"Complexity: {metadata.get('complexity', 'medium')}")
-            print(f"Expected terms: {metadata.get('expected_terms', [])}")
+            # Evaluate response
+            metrics = evaluator.evaluate_response(
+                prompt_name=prompt_name,
+                question=question,
+                answer=answer,
+                expected_structure=expected_structure,
+                metadata=metadata
+            )
 
-            # Get relevant documents
-            context = rag_system.retrieve(question)
-            formatted_context = rag_system.format_context(context)
+            # Add result
+            evaluator.add_result(
+                prompt_name=prompt_name,
+                question=question,
+                answer=answer,
+                metrics=metrics,
+                metadata={
+                    "template_type": prompt_name,
+                    "expected_structure": expected_structure,
+                    "complexity": metadata.get("complexity", "medium"),
+                    "expected_terms": metadata.get("expected_terms", [])
+                }
+            )
 
+            logger.info("\n[%s] Processed question: %s", prompt_name, question)
+            logger.info("Complexity: %s", metadata.get('complexity', 'medium'))
+            logger.info("Expected terms: %s", metadata.get('expected_terms', []))
+            logger.info("Metrics:")
+            for metric, value in metrics.items():
+                logger.info("- %s: %.3f", metric, value)
+
+        except Exception as e:
+            logger.error(
+                "Error testing prompt %s with question '%s': %s", prompt_name, question, e)
+
+    # Format every (prompt, question) pair up front
+    cases = []
+    for prompt_name, prompt in prompts.items():
+        for test_case in test_questions:
+            question = test_case["question"]
             try:
-                # Format prompt and get response
                 formatted_prompt = prompt.format(
-                    context=formatted_context,
+                    context=contexts[question],
                     question=question
                 )
-                response = llm.invoke(formatted_prompt)
-                answer = response.content if hasattr(
-                    response, 'content') else str(response)
-
-                # Evaluate response
-                metrics = evaluator.evaluate_response(
-                    prompt_name=prompt_name,
-                    question=question,
-                    answer=answer,
-                    expected_structure=expected_structure,
-                    metadata=metadata
-                )
-
-                # Add result
-                evaluator.add_result(
-                    prompt_name=prompt_name,
-                    question=question,
-                    answer=answer,
-                    metrics=metrics,
-                    metadata={
-                        "template_type": prompt_name,
-                        "expected_structure": expected_structure,
-                        "complexity": metadata.get("complexity", "medium"),
-                        "expected_terms": metadata.get("expected_terms", [])
-                    }
-                )
-
-                print("\nMetrics:")
-                for metric, value in metrics.items():
-                    print(f"- {metric}: {value:.3f}")
-
             except Exception as e:
-                print(
-                    f"Error testing prompt {prompt_name} with question '{question}': {str(e)}")
+                record_case(prompt_name, test_case, e)
+                continue
+            cases.append((prompt_name, test_case, formatted_prompt))
+
+    # Send all prompts as one batch; LangChain runs them concurrently up to
+    # max_concurrency and returns failures in place instead of raising
+    logger.info("\nTesting prompt templates: %s", ", ".join(prompts))
+    responses = await llm.abatch(
+        [formatted_prompt for _, _, formatted_prompt in cases],
+        config={"max_concurrency": max_concurrency},
+        return_exceptions=True
+    )
+    for (prompt_name, test_case, _), response in zip(cases, responses):
+        record_case(prompt_name, test_case, response)
 
     # Save results
     evaluator.save_results()
 
     # Print summary
     summary = evaluator.get_summary()
-    print("\nEvaluation Summary:")
-    print(f"Total evaluations: {summary['total_evaluations']}")
-    print(f"Prompts evaluated: {summary['prompts_evaluated']}")
-    print("\nAverage scores per prompt:")
+    logger.info("\nEvaluation Summary:")
+    logger.info("Total evaluations: %s", summary['total_evaluations'])
+    logger.info("Prompts evaluated: %s", summary['prompts_evaluated'])
+    logger.info("\nAverage scores per prompt:")
     for prompt_name, score in summary['average_scores'].items():
-        print(f"{prompt_name}: {score:.3f}")
-    print(f"\nBest performing prompt: {summary['best_performing_prompt']}")
+        logger.info("%s: %.3f", prompt_name, score)
+    logger.info("\nBest performing prompt: %s", summary['best_performing_prompt'])
+
+    # Aggregate per-prompt statistics in a single pass over the results
+    stats = {
+        prompt_name: {"count": 0, "term_usage": 0.0,
+                      "structure": 0.0, "by_complexity": {}}
+        for prompt_name in prompts
+    }
+    columns = evaluator.get_columns()
+    for prompt_name, complexity, overall, term_usage, structure in zip(
+            columns["prompt_name"], columns["complexity"],
+            columns["overall_score"], columns["term_usage_score"],
+            columns["structure_score"]):
+        prompt_stats = stats.get(prompt_name)
+        if prompt_stats is None:
+            continue
+        prompt_stats["count"] += 1
+        prompt_stats["term_usage"] += term_usage
+        prompt_stats["structure"] += structure
+        bucket = prompt_stats["by_complexity"].setdefault(
+            complexity, [0.0, 0])
+        bucket[0] += overall
+        bucket[1] += 1
 
     # Print detailed analysis
-    print("\nDetailed Analysis:")
-    for prompt_name in prompts:
-        prompt_results = [
-            r for r in evaluator.results if r.prompt_name == prompt_name]
-        print(f"\n{prompt_name.upper()} PROMPT:")
+    logger.info("\nDetailed Analysis:")
+    for prompt_name, prompt_stats in stats.items():
+        logger.info("\n%s PROMPT:", prompt_name.upper())
 
         # Analyze performance by complexity
         for complexity in ["low", "medium", "high"]:
-            complexity_results = [r for r in prompt_results
-                                  if r.metadata.get("complexity") == complexity]
-            if complexity_results:
-                avg_score = sum(r.metrics["overall_score"]
-                                for r in complexity_results) / len(complexity_results)
-                print(
-                    f"- {complexity.title()} complexity questions: {avg_score:.3f}")
+            bucket = prompt_stats["by_complexity"].get(complexity)
+            if bucket:
+                logger.info("- %s complexity questions: %.3f",
+                            complexity.title(), bucket[0] / bucket[1])
+
+        count = prompt_stats["count"]
 
         # Analyze term usage
-        term_scores = [r.metrics["term_usage_score"] for r in prompt_results]
-        avg_term_score = sum(term_scores) / \
-            len(term_scores) if term_scores else 0
-        print(f"- Average term usage score: {avg_term_score:.3f}")
+        avg_term_score = prompt_stats["term_usage"] / count if count else 0
+        logger.info("- Average term usage score: %.3f", avg_term_score)
 
         # Analyze structure adherence
-        structure_scores = [r.metrics["structure_score"]
-                            for r in prompt_results]
-        avg_structure_score = sum(structure_scores) / \
-            len(structure_scores) if structure_scores else 0
-        print(f"- Average structure score: {avg_structure_score:.3f}")
-
+        avg_structure_score = prompt_stats["structure"] / \
+            count if count else 0
+        logger.info("- Average structure score: %.3f", avg_structure_score)
 
 if __name__ == "__main__":
+    from langchain.globals import set_llm_cache
+    from langchain_community.cache import SQLiteCache
+
+    # Persist LLM responses across runs: at temperature 0 the same formatted
+    # prompt gives the same answer, so re-runs skip the network call
+    os.makedirs("evaluation_results", exist_ok=True)
+    set_llm_cache(SQLiteCache(
+        database_path=os.path.join("evaluation_results", "llm_cache.db")))
+
     # Initialize components
     rag_system = TurkishLegalRAG(
         law_json_path=os.path.join(
@@ -198,7 +256,24 @@ if __name__ == "__main__":
         temperature=0
     )
 
-    evaluator = PromptEvaluator(output_dir="evaluation_results")
+    # Stream each result to a JSONL file as well, so an interrupted run
+    # keeps what was evaluated so far
+    evaluator = PromptEvaluator(
+        output_dir="evaluation_results", stream_results=True)
+
+    # Buffer report lines and write them to stdout in batches instead of one
+    # write per line; errors flush the buffer immediately
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    memory_handler = logging.handlers.MemoryHandler(
+        capacity=1024, flushLevel=logging.ERROR, target=stream_handler)
+    logger.addHandler(memory_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
 
     # Run tests
-    test_prompts(rag_system, llm, evaluator)
+    try:
+        asyncio.run(test_prompts(rag_system, llm, evaluator))
+    finally:
+        evaluator.close()
+        memory_handler.close()
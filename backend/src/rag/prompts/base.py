@@ -1,6 +1,7 @@
 """Base class for prompt templates."""
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from string import Formatter
+from typing import Dict, Any, List, Optional, Tuple
 
 
 class BasePromptTemplate(ABC):
@@ -13,6 +14,12 @@ class BasePromptTemplate(ABC):
             template: The prompt template string
         """
         self.template = template
+        # Parse the template once into (literal, field) pairs so formatting
+        # is a join instead of a str.format parse on every call
+        self._parts: List[Tuple[str, Optional[str]]] = [
+            (literal, field_name)
+            for literal, field_name, _, _ in Formatter().parse(template)
+        ]
         self.metadata: Dict[str, Any] = {
             "name": self.__class__.__name__,
             "description": self.__doc__ or "",
@@ -43,6 +50,22 @@ class BasePromptTemplate(ABC):
         """
         pass
 
+    def _render(self, values: Dict[str, Any]) -> str:
+        """Fill the pre-parsed template with the given values.
+
+        Args:
+            values: Values for the template placeholders
+
+        Returns:
+            str: The formatted template
+        """
+        out = []
+        for literal, field_name in self._parts:
+            out.append(literal)
+            if field_name is not None:
+                out.append(str(values[field_name]))
+        return "".join(out)
+
     def add_metadata(self, key: str, value: Any) -> None:
         """Add metadata to the prompt template.
 
@@ -1,13 +1,87 @@
 """Evaluation system for prompt templates."""
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
-import json
+from typing import Dict, List, Any, Optional, Pattern, Sequence, Tuple
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+
+import numpy as np
+import orjson
+import hashlib
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-
-@dataclass
+# Fixed patterns used by the metrics, compiled once at import
+_ARTICLE_REF_RE = re.compile(r"Madde\s+\d+")
+_INLINE_REF_RE = re.compile(r"\(Madde\s+\d+\)")
+_DEFINITION_RE = re.compile(r'"([^"]+)"\s*(?::|tanımı:|terimi:)\s*([^.]+)')
+_BOLD_RE = re.compile(r'\*\*[^*]+\*\*')
+_BULLET_RE = re.compile(r'[-•]\s+\w+')
+_NUMBERED_RE = re.compile(r'\d+\.\s+\w+')
+_HEADER_RE = re.compile(r'^[A-ZİĞÜŞÖÇ\s]+:', re.MULTILINE)
+
+# Version of the scoring rules, stored with every result so scores from
+# different rule sets are not compared by accident:
+#   1: each section searched separately; structure content ran up to the
+#      next occurrence of the first expected section
+#   2: the answer is split at all section headers in one pass; a section's
+#      content ends at the next expected section header
+METRICS_VERSION = 2
+
+# Metrics kept as columns for aggregation, alongside the result objects;
+# results whose metrics lack one of them get NaN in that column
+_METRIC_COLUMNS = ("overall_score", "term_usage_score", "structure_score")
+_MISSING_METRIC = float("nan")
+
+# Sections scored by the completeness metric, in answer order
+_SECTIONS = (
+    "SORU KAPSAMI",
+    "İLGİLİ KANUN MADDELERİ",
+    "HUKUKİ ANALİZ",
+    "SONUÇ"
+)
+
+
+# Per-complexity section scoring: minimum content length and the weight of
+# each section in _SECTIONS order
+_COMPLETENESS_PARAMS = {
+    "low": (100, (0.3, 0.2, 0.2, 0.3)),  # More weight on scope and conclusion
+    "medium": (200, (0.25, 0.25, 0.25, 0.25)),  # Equal weights
+    "high": (300, (0.2, 0.3, 0.3, 0.2)),  # More weight on analysis
+}
+
+
+@lru_cache(maxsize=32)
+def _section_header_re(sections: Tuple[str, ...]) -> Pattern:
+    """Compile one alternation matching any of the section headers."""
+    # Longest first so a header is never cut short by a section name it contains
+    names = sorted(sections, key=len, reverse=True)
+    return re.compile("(" + "|".join(map(re.escape, names)) + "):?")
+
+
+@lru_cache(maxsize=64)
+def _lowered_terms(terms: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Lowercase a set of expected terms once; test cases reuse the same lists."""
+    return tuple(term.lower() for term in terms)
+
+
+def _split_sections(answer: str, sections: Sequence[str]) -> Dict[str, str]:
+    """Map each section header found in the answer to its content.
+
+    A section's content runs from its header to the next header of any
+    listed section (or the end of the answer); only the first occurrence of
+    each header is used.
+    """
+    hits = list(_section_header_re(tuple(sections)).finditer(answer))
+    contents: Dict[str, str] = {}
+    for i, match in enumerate(hits):
+        end = hits[i + 1].start() if i + 1 < len(hits) else len(answer)
+        contents.setdefault(match.group(1), answer[match.end():end])
+    return contents
+
+
+@dataclass(frozen=True)
 class EvaluationResult:
     """Data class for evaluation results."""
     prompt_name: str
@@ -15,21 +89,48 @@ class EvaluationResult:
     answer: str
     metrics: Dict[str, float]
     metadata: Dict[str, Any]
-    timestamp: str = datetime.now().isoformat()
+    timestamp: str = field(
+        default_factory=lambda: datetime.now().isoformat())
+    # Scoring rules the metrics were computed with; results saved before the
+    # version was recorded load as version 1
+    metrics_version: int = 1
 
 
 class PromptEvaluator:
     """Evaluator for different prompt templates."""
 
-    def __init__(self, output_dir: str = "evaluation_results"):
+    def __init__(
+        self,
+        output_dir: str = "evaluation_results",
+        stream_results: bool = False,
+        metrics_cache_size: int = 4096
+    ):
         """Initialize the evaluator.
 
         Args:
             output_dir: Directory to save evaluation results
+            stream_results: Also append each result to a JSONL file as it is
+                added, flushed per record so partial results survive an
+                interrupted run; call close() (or use the evaluator as a
+                context manager) when done
+            metrics_cache_size: Maximum number of cached metric results
+                (0 disables the cache)
         """
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
+        self._stream = None
+        if stream_results:
+            self.stream_path = os.path.join(
+                output_dir, f"evaluation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+            self._stream = open(self.stream_path, 'ab')
         self.results: List[EvaluationResult] = []
+        # Column-wise copy of the fields aggregations read, one entry per
+        # result, so summaries scan flat lists instead of per-result dicts
+        self._columns: Dict[str, List[Any]] = self._empty_columns()
+        # Metrics are deterministic in (answer, expected structure, metadata);
+        # keep them by content hash so repeated answers are scored once
+        self._metrics_cache: "OrderedDict[bytes, Dict[str, float]]" = OrderedDict()
+        self._metrics_cache_size = metrics_cache_size
 
         # Legal terms patterns (common Turkish legal terms)
         self.legal_terms_patterns = [
@@ -50,6 +151,20 @@ class PromptEvaluator:
             r"içtima",
             r"zamanaşımı"
         ]
+        self._compile_legal_terms()
+
+    def _compile_legal_terms(self) -> None:
+        """Compile the legal term patterns used by the term metrics."""
+        self._legal_term_res = [re.compile(pattern)
+                                for pattern in self.legal_terms_patterns]
+        # Section quality indicators in one scan: list items and legal
+        # terms, told apart by the matching group. The list branch keeps the
+        # original section completeness pattern ('[-•]\d+\.]\s+\w+') so
+        # scores stay comparable across runs, and only consumes the marker so
+        # a term right after it still matches.
+        self._section_quality_re = re.compile(
+            r"(?P<list>[-•]\d+\.\](?=\s+\w))|(?P<term>"
+            + "|".join(self.legal_terms_patterns) + ")")
 
     def evaluate_response(
         self,
@@ -60,12 +175,24 @@ class PromptEvaluator:
         metadata: Optional[Dict[str, Any]] = None
     ) -> Dict[str, float]:
         """Evaluate a response based on various metrics."""
+        cache_key = self._metrics_cache_key(
+            answer, expected_structure, metadata)
+        cached = self._get_cached_metrics(cache_key)
+        if cached is not None:
+            return dict(cached)
+
         metrics = {}
 
+        # Split the answer into sections once and share it between the
+        # structure and completeness metrics
+        section_contents = _split_sections(answer, _SECTIONS)
+
         # Content length and quality metrics
         metrics["length_score"] = self._evaluate_length(answer)
         metrics["structure_score"] = self._evaluate_structure(
-            answer, expected_structure) if expected_structure else 1.0
+            answer, expected_structure,
+            section_contents if tuple(expected_structure or ()) == _SECTIONS else None
+        ) if expected_structure else 1.0
 
         # Legal specific metrics
         metrics["legal_reference_score"] = self._evaluate_legal_references(
@@ -75,7 +202,8 @@ class PromptEvaluator:
         metrics["term_usage_score"] = self._evaluate_legal_terms(
             answer,
             expected_terms=metadata.get(
-                "expected_terms", []) if metadata else []
+                "expected_terms", []) if metadata else [],
+            answer_lower=answer.lower()
         )
         metrics["formatting_score"] = self._evaluate_formatting(answer)
 
@@ -83,7 +211,8 @@ class PromptEvaluator:
         metrics["section_completeness"] = self._evaluate_section_completeness(
             answer,
             complexity=metadata.get(
-                "complexity", "medium") if metadata else "medium"
+                "complexity", "medium") if metadata else "medium",
+            section_contents=section_contents
         )
 
         # Calculate overall score with weighted components
@@ -101,8 +230,86 @@ class PromptEvaluator:
             for key, weight in weights.items()
         )
 
+        self._cache_metrics(cache_key, metrics)
+        return metrics
+
+    def evaluate_batch(
+        self,
+        cases: List[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        chunksize: int = 16
+    ) -> List[Dict[str, float]]:
+        """Evaluate many responses, spreading uncached ones over worker processes.
+
+        Args:
+            cases: One dict per response with evaluate_response's keyword
+                arguments ("answer" is required)
+            max_workers: Number of worker processes, defaults to the CPU count
+            chunksize: Number of cases sent to a worker at a time
+
+        Returns:
+            List[Dict[str, float]]: Metrics for each case, in input order
+        """
+        batch: List[Optional[Dict[str, float]]] = [None] * len(cases)
+        pending = []
+        for i, case in enumerate(cases):
+            key = self._metrics_cache_key(
+                case["answer"], case.get("expected_structure"), case.get("metadata"))
+            cached = self._get_cached_metrics(key)
+            if cached is not None:
+                batch[i] = dict(cached)
+            else:
+                pending.append((i, key))
+
+        if pending:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_batch_worker,
+                initargs=(self.output_dir, tuple(self.legal_terms_patterns))
+            ) as executor:
+                all_metrics = executor.map(
+                    _evaluate_batch_case,
+                    [cases[i] for i, _ in pending],
+                    chunksize=chunksize
+                )
+                for (i, key), metrics in zip(pending, all_metrics):
+                    self._cache_metrics(key, metrics)
+                    batch[i] = metrics
+
+        return batch
+
+    def _get_cached_metrics(self, key: bytes) -> Optional[Dict[str, float]]:
+        metrics = self._metrics_cache.get(key)
+        if metrics is not None:
+            self._metrics_cache.move_to_end(key)
         return metrics
 
+    def _cache_metrics(self, key: bytes, metrics: Dict[str, float]) -> None:
+        if self._metrics_cache_size <= 0:
+            return
+        self._metrics_cache[key] = dict(metrics)
+        self._metrics_cache.move_to_end(key)
+        while len(self._metrics_cache) > self._metrics_cache_size:
+            self._metrics_cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Drop all cached metric results."""
+        self._metrics_cache.clear()
+
+    @staticmethod
+    def _metrics_cache_key(
+        answer: str,
+        expected_structure: Optional[List[str]],
+        metadata: Optional[Dict[str, Any]]
+    ) -> bytes:
+        """Build a compact content hash of the inputs that drive the metrics."""
+        normalized = "\x1f".join([
+            answer,
+            repr(list(expected_structure or [])),
+            repr(sorted((metadata or {}).items()))
+        ])
+        return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
     def _evaluate_length(self, answer: str) -> float:
         """Evaluate the length and detail of the answer."""
         # Target length is between 300 and 1000 characters
@@ -113,12 +320,19 @@ class PromptEvaluator:
             return 1.0 - ((length - 1000) / 1000)
         return 1.0
 
-    def _evaluate_structure(self, answer: str, expected_sections: List[str]) -> float:
+    def _evaluate_structure(
+        self,
+        answer: str,
+        expected_sections: List[str],
+        section_contents: Optional[Dict[str, str]] = None
+    ) -> float:
         """Evaluate if the answer follows the expected structure.
 
         Args:
             answer: Generated answer
             expected_sections: List of expected section names
+            section_contents: Optional answer already split at the expected
+                section headers
 
         Returns:
             float: Structure score (0-1)
@@ -126,30 +340,33 @@ class PromptEvaluator:
         if not expected_sections:
             return 1.0
 
+        if section_contents is None:
+            section_contents = _split_sections(answer, expected_sections)
+
         found_sections = 0
         total_sections = len(expected_sections)
 
         for section in expected_sections:
             # Check for section headers
-            if section in answer:
-                found_sections += 1
+            content = section_contents.get(section)
+            if content is None:
+                continue
+            found_sections += 1
 
-            # Check for section content (at least 2 lines after header)
-            section_pattern = f"{section}:?(.*?)(?={expected_sections[0]}|$)" if expected_sections else ""
-            if section_pattern:
-                match = re.search(section_pattern, answer, re.DOTALL)
-                if match and len(match.group(1).strip().split('\n')) >= 2:
-                    found_sections += 0.5
+            # Check for section content (at least 2 lines before the next
+            # section header)
+            if '\n' in content.strip():
+                found_sections += 0.5
 
         return min(1.0, found_sections / (total_sections * 1.5))
 
     def _evaluate_legal_references(self, answer: str, min_articles: int = 2) -> float:
         """Evaluate the usage and formatting of legal references."""
         # Count properly formatted article references
-        article_refs = re.findall(r"Madde\s+\d+", answer)
+        article_refs = _ARTICLE_REF_RE.findall(answer)
 
         # Count inline references
-        inline_refs = re.findall(r"\(Madde\s+\d+\)", answer)
+        inline_refs = _INLINE_REF_RE.findall(answer)
 
         # Calculate base score based on number of references
         ref_count = len(article_refs) + len(inline_refs)
@@ -164,25 +381,31 @@ class PromptEvaluator:
 
         return min(1.0, base_score + format_bonus + excess_bonus)
 
-    def _evaluate_legal_terms(self, answer: str, expected_terms: List[str] = None) -> float:
+    def _evaluate_legal_terms(
+        self,
+        answer: str,
+        expected_terms: List[str] = None,
+        answer_lower: Optional[str] = None
+    ) -> float:
         """Evaluate the usage of legal terminology."""
         term_count = 0
         expected_term_count = 0
+        if answer_lower is None:
+            answer_lower = answer.lower()
 
         # Check for expected terms if provided
         if expected_terms:
-            for term in expected_terms:
-                if term.lower() in answer.lower():
-                    expected_term_count += 1
+            expected_term_count = sum(
+                1 for term in _lowered_terms(tuple(expected_terms))
+                if term in answer_lower)
 
-        # Check for general legal terms
-        for pattern in self.legal_terms_patterns:
-            matches = re.findall(pattern, answer.lower())
-            term_count += len(matches)
+        # Check for general legal terms; each pattern is counted on its own
+        # so nested terms ("kusur" in "kusur yeteneği") keep counting twice
+        for term_re in self._legal_term_res:
+            term_count += len(term_re.findall(answer_lower))
 
         # Check for term definitions
-        definitions = re.findall(
-            r'"([^"]+)"\s*(?::|tanımı:|terimi:)\s*([^.]+)', answer)
+        definitions = _DEFINITION_RE.findall(answer)
         term_count += len(definitions) * 2  # Definitions are weighted more
 
         # Calculate scores
@@ -197,79 +420,66 @@ class PromptEvaluator:
         score = 0.0
 
         # Check for bold text
-        if re.search(r'\*\*[^*]+\*\*', answer):
+        if _BOLD_RE.search(answer):
             score += 0.2
 
         # Check for bullet points
-        if re.search(r'[-•]\s+\w+', answer):
+        if _BULLET_RE.search(answer):
             score += 0.2
 
         # Check for numbered lists
-        if re.search(r'\d+\.\s+\w+', answer):
+        if _NUMBERED_RE.search(answer):
             score += 0.2
 
         # Check for paragraph breaks
-        if re.search(r'\n\n', answer):
+        if '\n\n' in answer:
             score += 0.2
 
         # Check for consistent capitalization in headers
-        if re.search(r'^[A-ZİĞÜŞÖÇ\s]+:', answer, re.MULTILINE):
+        if _HEADER_RE.search(answer):
             score += 0.2
 
         return score
 
-    def _evaluate_section_completeness(self, answer: str, complexity: str = "medium") -> float:
+    def _evaluate_section_completeness(
+        self,
+        answer: str,
+        complexity: str = "medium",
+        section_contents: Optional[Dict[str, str]] = None
+    ) -> float:
         """Evaluate how complete each section is."""
-        sections = [
-            "SORU KAPSAMI",
-            "İLGİLİ KANUN MADDELERİ",
-            "HUKUKİ ANALİZ",
-            "SONUÇ"
-        ]
+        if section_contents is None:
+            section_contents = _split_sections(answer, _SECTIONS)
 
-        # Adjust minimum content length based on complexity
-        min_content_length = {
-            "low": 100,
-            "medium": 200,
-            "high": 300
-        }.get(complexity.lower(), 200)
+        # Minimum content length and section weights depend on complexity
+        min_content_length, weights = _COMPLETENESS_PARAMS.get(
+            complexity.lower(), _COMPLETENESS_PARAMS["medium"])
 
         section_scores = []
-        for i, section in enumerate(sections):
-            next_section = sections[i + 1] if i < len(sections) - 1 else None
+        for section in _SECTIONS:
+            content = section_contents.get(section)
 
-            # Extract section content
-            pattern = f"{section}:?(.*?)(?={next_section}:|$)" if next_section else f"{section}:?(.*?)$"
-            match = re.search(pattern, answer, re.DOTALL)
-
-            if match:
-                content = match.group(1).strip()
+            if content is not None:
+                content = content.strip()
 
                 # Score based on content length and complexity
                 length_score = min(1.0, len(content) / min_content_length)
 
-                # Check for bullet points or numbered items
-                structure_score = 0.5 if re.search(
-                    r'[-•]\d+\.]\s+\w+', content) else 0.0
-
-                # Check for legal references and terms
-                legal_score = 0.5 if any(term in content.lower()
-                                         for term in self.legal_terms_patterns) else 0.0
+                # Check for list items and legal terms, stopping once both
+                # have been seen
+                found = set()
+                for match in self._section_quality_re.finditer(content.lower()):
+                    found.add(match.lastgroup)
+                    if len(found) == 2:
+                        break
+                structure_score = 0.5 if "list" in found else 0.0
+                legal_score = 0.5 if "term" in found else 0.0
 
                 section_scores.append(
                     (length_score + structure_score + legal_score) / 3)
             else:
                 section_scores.append(0.0)
 
-        # Weight sections differently based on complexity
-        if complexity.lower() == "high":
-            weights = [0.2, 0.3, 0.3, 0.2]  # More weight on analysis
-        elif complexity.lower() == "low":
-            # More weight on scope and conclusion
-            weights = [0.3, 0.2, 0.2, 0.3]
-        else:
-            weights = [0.25, 0.25, 0.25, 0.25]  # Equal weights
-
         return sum(score * weight for score, weight in zip(section_scores, weights))
 
     def add_result(
@@ -278,7 +488,8 @@ class PromptEvaluator:
         question: str,
         answer: str,
         metrics: Dict[str, float],
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None
     ) -> None:
         """Add an evaluation result.
 
@@ -288,15 +499,59 @@ class PromptEvaluator:
             answer: Generated answer
             metrics: Evaluation metrics
             metadata: Additional metadata
+            timestamp: Optional ISO timestamp, defaults to the current time
         """
-        result = EvaluationResult(
-            prompt_name=prompt_name,
-            question=question,
-            answer=answer,
-            metrics=metrics,
-            metadata=metadata or {}
-        )
+        result_fields = {
+            "prompt_name": prompt_name,
+            "question": question,
+            "answer": answer,
+            "metrics": metrics,
+            "metadata": metadata or {},
+            "metrics_version": METRICS_VERSION
+        }
+        if timestamp is not None:
+            result_fields["timestamp"] = timestamp
+        result = EvaluationResult(**result_fields)
         self.results.append(result)
+        self._append_columns(result)
+        if self._stream is not None:
+            self._stream.write(orjson.dumps(asdict(result)) + b"\n")
+            self._stream.flush()
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, List[Any]]:
+        columns: Dict[str, List[Any]] = {"prompt_name": [], "complexity": []}
+        for key in _METRIC_COLUMNS:
+            columns[key] = []
+        return columns
+
+    def _append_columns(self, result: EvaluationResult) -> None:
+        columns = self._columns
+        columns["prompt_name"].append(result.prompt_name)
+        columns["complexity"].append(result.metadata.get("complexity"))
+        for key in _METRIC_COLUMNS:
+            columns[key].append(result.metrics.get(key, _MISSING_METRIC))
+
+    def get_columns(self) -> Dict[str, List[Any]]:
+        """Get prompt names, complexities and key metrics as parallel lists.
+
+        Returns:
+            Dict[str, List[Any]]: One list per field, aligned with self.results;
+                metrics missing from a result are NaN
+        """
+        return self._columns
+
+    def close(self) -> None:
+        """Close the JSONL stream, if one is open."""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def __enter__(self) -> "PromptEvaluator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def save_results(self, filename: Optional[str] = None) -> None:
         """Save evaluation results to a JSON file.
@@ -309,37 +564,38 @@ class PromptEvaluator:
 
         path = os.path.join(self.output_dir, filename)
 
-        # Convert results to dictionary format
-        results_dict = [
-            {
-                "prompt_name": r.prompt_name,
-                "question": r.question,
-                "answer": r.answer,
-                "metrics": r.metrics,
-                "metadata": r.metadata,
-                "timestamp": r.timestamp
-            }
-            for r in self.results
-        ]
-
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(results_dict, f, ensure_ascii=False, indent=2)
+        # Write the array one record at a time instead of building a list
+        # of dicts for the whole result set
+        with open(path, 'wb') as f:
+            f.write(b"[")
+            separator = b"\n"
+            for result in self.results:
+                f.write(separator)
+                f.write(orjson.dumps(asdict(result), option=orjson.OPT_INDENT_2))
+                separator = b",\n"
+            f.write(b"\n]" if self.results else b"]")
 
     def load_results(self, filename: str) -> None:
-        """Load evaluation results from a JSON file.
+        """Load evaluation results from a JSON or JSONL file.
 
         Args:
-            filename: Name of the file to load
+            filename: Name of the file to load; ``.jsonl`` files (as written
+                with stream_results) are read one line at a time
         """
         path = os.path.join(self.output_dir, filename)
 
-        with open(path, 'r', encoding='utf-8') as f:
-            results_dict = json.load(f)
+        self.results = []
+        self._columns = self._empty_columns()
+        with open(path, 'rb') as f:
+            if filename.endswith(".jsonl"):
+                records = (orjson.loads(line) for line in f if line.strip())
+            else:
+                records = orjson.loads(f.read())
 
-        self.results = [
-            EvaluationResult(**result)
-            for result in results_dict
-        ]
+            for record in records:
+                result = EvaluationResult(**record)
+                self.results.append(result)
+                self._append_columns(result)
 
     def get_summary(self) -> Dict[str, Any]:
         """Get a summary of evaluation results.
@@ -350,29 +606,54 @@ class PromptEvaluator:
         if not self.results:
             return {"error": "No results available"}
 
+        # Group overall scores per prompt, keeping first-appearance order;
+        # results without an overall score are left out of the averages
+        names, first_index, prompt_ids = np.unique(
+            np.asarray(self._columns["prompt_name"], dtype=object),
+            return_index=True,
+            return_inverse=True
+        )
+        scores = np.asarray(self._columns["overall_score"], dtype=np.float64)
+        scored = ~np.isnan(scores)
+        sums = np.bincount(prompt_ids[scored], weights=scores[scored],
+                           minlength=len(names))
+        counts = np.bincount(prompt_ids[scored], minlength=len(names))
+
+        average_scores = {
+            names[i]: float(sums[i] / counts[i])
+            for i in np.argsort(first_index) if counts[i]
+        }
+        best_prompt, best_score = max(
+            average_scores.items(), key=lambda item: item[1],
+            default=("", 0.0))
+
         summary = {
             "total_evaluations": len(self.results),
-            "prompts_evaluated": len(set(r.prompt_name for r in self.results)),
-            "average_scores": {},
-            "best_performing_prompt": "",
+            "prompts_evaluated": len(names),
+            "average_scores": average_scores,
+            "best_performing_prompt": best_prompt if best_score > 0 else "",
             "timestamp": datetime.now().isoformat()
         }
 
-        # Calculate average scores per prompt
-        prompt_scores: Dict[str, List[float]] = {}
-        for result in self.results:
-            if result.prompt_name not in prompt_scores:
-                prompt_scores[result.prompt_name] = []
-            prompt_scores[result.prompt_name].append(
-                result.metrics["overall_score"])
-
-        # Calculate averages and find best prompt
-        best_score = 0
-        for prompt_name, scores in prompt_scores.items():
-            avg_score = sum(scores) / len(scores)
-            summary["average_scores"][prompt_name] = avg_score
-            if avg_score > best_score:
-                best_score = avg_score
-                summary["best_performing_prompt"] = prompt_name
-
         return summary
+
+
+# Per-process evaluator used by PromptEvaluator.evaluate_batch workers
+_batch_evaluator: Optional[PromptEvaluator] = None
+
+
+def _init_batch_worker(output_dir: str, legal_terms_patterns: Tuple[str, ...]) -> None:
+    global _batch_evaluator
+    _batch_evaluator = PromptEvaluator(output_dir=output_dir)
+    _batch_evaluator.legal_terms_patterns = list(legal_terms_patterns)
+    _batch_evaluator._compile_legal_terms()
+
+
+def _evaluate_batch_case(case: Dict[str, Any]) -> Dict[str, float]:
+    return _batch_evaluator.evaluate_response(
+        prompt_name=case.get("prompt_name", ""),
+        question=case.get("question", ""),
+        answer=case["answer"],
+        expected_structure=case.get("expected_structure"),
+        metadata=case.get("metadata")
+    )
@@ -2,17 +2,15 @@
 from typing import Dict, Any, List
 from .base import BasePromptTemplate
 
+# Placeholders every legal prompt template must be given
+_REQUIRED_INPUTS = frozenset({"context", "question"})
+
 
 class BasicLegalPrompt(BasePromptTemplate):
     """Basic prompt template for legal questions."""
 
     def __init__(self):
         template = """Sen Türk Ceza Kanunu konusunda uzmanlaşmış bir hukuk asistanısın.
-        
-Bağlam:
-{context}
-
-Soru: {question}
 
 Yanıtını oluştururken şu kurallara uy:
 1. Sadece verilen bağlamda bulunan bilgileri kullan
@@ -20,6 +18,11 @@ Yanıtını oluştururken şu kurallara uy:
 3. Cevabını kanun maddeleriyle destekle
 4. Açık ve anlaşılır bir dil kullan
 
+Bağlam:
+{context}
+
+Soru: {question}
+
 Yanıt:"""
         super().__init__(template)
 
@@ -27,11 +30,11 @@ Yanıt:"""
         """Format the template with context and question."""
         if not self.validate_inputs(**kwargs):
             raise ValueError("Invalid inputs")
-        return self.template.format(**kwargs)
+        return self._render(kwargs)
 
     def validate_inputs(self, **kwargs) -> bool:
         """Validate required inputs exist."""
-        return all(k in kwargs for k in ["context", "question"])
+        return _REQUIRED_INPUTS.issubset(kwargs)
 
 
 class StructuredLegalPrompt(BasePromptTemplate):
@@ -40,11 +43,6 @@ class StructuredLegalPrompt(BasePromptTemplate):
     def __init__(self):
         template = """Sen Türk Ceza Kanunu konusunda uzmanlaşmış bir hukuk asistanısın.
 
-Bağlam:
-{context}
-
-Soru: {question}
-
 Yanıtını aşağıdaki yapıda oluştur:
 
 1. SORU KAPSAMI:
@@ -80,6 +78,11 @@ Yanıtını oluştururken şu kurallara kesinlikle uy:
 7. Bölümler arasında mantıksal bağlantı kur
 8. Önemli noktaları bold (**) ile vurgula
 
+Bağlam:
+{context}
+
+Soru: {question}
+
 Yanıt:"""
         super().__init__(template)
         self.metadata["sections"] = [
@@ -93,11 +96,11 @@ Yanıt:"""
         """Format the template with context and question."""
         if not self.validate_inputs(**kwargs):
             raise ValueError("Invalid inputs")
-        return self.template.format(**kwargs)
+        return self._render(kwargs)
 
     def validate_inputs(self, **kwargs) -> bool:
         """Validate required inputs exist."""
-        return all(k in kwargs for k in ["context", "question"])
+        return _REQUIRED_INPUTS.issubset(kwargs)
 
     def get_sections(self) -> List[str]:
         """Get the defined sections."""
@@ -110,11 +113,6 @@ class MultiStepLegalPrompt(BasePromptTemplate):
     def __init__(self):
         template = """Sen Türk Ceza Kanunu konusunda uzmanlaşmış bir hukuk asistanısın.
 
-Bağlam:
-{context}
-
-Soru: {question}
-
 Bu soruyu yanıtlamak için aşağıdaki adımları izle:
 
 1. SORU ANALİZİ:
@@ -144,6 +142,11 @@ Yanıtını oluştururken şu kurallara uy:
 4. Açık ve anlaşılır bir dil kullan
 5. Adımlar arasında mantıksal bağlantı kur
 
+Bağlam:
+{context}
+
+Soru: {question}
+
 Yanıt:"""
         super().__init__(template)
         self.metadata["steps"] = [
@@ -157,11 +160,11 @@ Yanıt:"""
         """Format the template with context and question."""
         if not self.validate_inputs(**kwargs):
             raise ValueError("Invalid inputs")
-        return self.template.format(**kwargs)
+        return self._render(kwargs)
 
     def validate_inputs(self, **kwargs) -> bool:
         """Validate required inputs exist."""
-        return all(k in kwargs for k in ["context", "question"])
+        return _REQUIRED_INPUTS.issubset(kwargs)
 
     def get_steps(self) -> List[str]:
         """Get the reasoning steps."""
@@ -2,22 +2,18 @@
 QA chain implementation for the Turkish Legal RAG system.
 """
 
-from typing import Any, Dict, List, Optional
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.language_models import BaseLanguageModel
 
-from .retriever import DocumentRetriever
-
 # Enhanced prompt template that better handles legal terminology
 PROMPT_TEMPLATE = """Sen Türk Ceza Kanunu konusunda uzmanlaşmış bir hukuk asistanısın. SADECE Türk Ceza Kanunu ve verilen bağlam çerçevesinde soruları yanıtlayabilirsin.
 
-Bağlam:
-{context}
-
-Soru: {question}
-
 Yanıtını oluştururken şu kurallara kesinlikle uy:
 1. SADECE verilen bağlamda bulunan bilgileri kullan
 2. Eğer verilen bağlamda soruyu yanıtlamak için yeterli bilgi yoksa, "Üzgünüm, bu soru Türk Ceza Kanunu kapsamı dışındadır veya verilen bağlamda bu soruyu yanıtlamak için yeterli bilgi bulunmamaktadır." şeklinde yanıt ver
@@ -26,9 +22,18 @@ Yanıtını oluştururken şu kurallara kesinlikle uy:
 5. Açık, anlaşılır ve profesyonel bir dil kullan
 6. Asla verilen bağlam dışında bilgi uydurma veya tahmin yürütme
 
+Bağlam:
+{context}
+
+Soru: {question}
+
 Yanıt:"""
 
 
+# Prefixes of the messages run() returns instead of raising on LLM failures
+ERROR_ANSWER_PREFIXES = ("Error:", "An error occurred")
+
+
 class LegalQAChain:
     """A chain for question-answering about Turkish legal texts."""
 
@@ -36,32 +41,93 @@ class LegalQAChain:
         self,
         rag_system: Any,
         llm: BaseLanguageModel,
+        cache_size: int = 0,
+        n_results: int = 5
     ):
-        """Initialize the QA chain with RAG system and LLM."""
+        """Initialize the QA chain with RAG system and LLM.
+
+        Args:
+            rag_system: RAG system used for document retrieval
+            llm: Language model that generates the answers
+            cache_size: Maximum number of cached retrievals and answers; 0
+                (the default) disables caching, e.g. for sampled LLM output
+            n_results: Number of articles (and of legal terms) the chain
+                answers from
+        """
         self.rag_system = rag_system
         self.llm = llm
+        self.n_results = n_results
+        # LRU caches of retrieved documents keyed by question and filter, and
+        # of answers keyed by context hash and question
+        self._cache_size = cache_size
+        self._retrieval_cache: "OrderedDict[Tuple, List[Dict]]" = OrderedDict()
+        self._response_cache: "OrderedDict[Tuple[bytes, str], str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
         self._setup_chain()
 
     def _setup_chain(self):
         """Set up the chain using the new LangChain syntax."""
         self.prompt = ChatPromptTemplate.from_template(PROMPT_TEMPLATE)
+        self.answer_chain = self.prompt | self.llm | StrOutputParser()
 
         # Create the chain using the new syntax
         self.chain = (
             {
                 "context": lambda x: self.format_context(
-                    self.rag_system.retrieve(
-                        query=x["question"],
-                        metadata_filter=x.get("metadata_filter")
-                    )
-                ),
+                    self._get_documents(x)),
                 "question": lambda x: x["question"]
             }
-            | self.prompt
-            | self.llm
-            | StrOutputParser()
+            | self.answer_chain
+        )
+
+    def _get_documents(self, inputs: Dict[str, Any]) -> List[Dict]:
+        """Use documents supplied by the caller, retrieving only if none were given."""
+        if inputs.get("retrieved_docs") is not None:
+            return inputs["retrieved_docs"]
+        return self.rag_system.retrieve(
+            query=inputs["question"],
+            n_results=self.n_results,
+            metadata_filter=inputs.get("metadata_filter")
         )
 
+    def _get_documents_cached(
+        self,
+        question: str,
+        metadata_filter: Optional[Dict[str, str]]
+    ) -> List[Dict]:
+        """Retrieve documents, reusing results for a repeated question and filter."""
+        key = (question, tuple(sorted((metadata_filter or {}).items())))
+        docs = self._get_cached(self._retrieval_cache, key)
+        if docs is None:
+            docs = self.rag_system.retrieve(
+                query=question,
+                n_results=self.n_results,
+                metadata_filter=metadata_filter
+            )
+            self._store_cached(self._retrieval_cache, key, docs)
+        return docs
+
+    def _get_cached(self, cache: OrderedDict, key: Hashable) -> Any:
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _store_cached(self, cache: OrderedDict, key: Hashable, value: Any) -> None:
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self._cache_size:
+                cache.popitem(last=False)
+
+    def invalidate_cache(self) -> None:
+        """Drop cached retrievals and answers, e.g. after re-indexing documents."""
+        with self._cache_lock:
+            self._retrieval_cache.clear()
+            self._response_cache.clear()
+
     def format_context(self, retrieved_docs: List[Dict]) -> str:
         """Format retrieved documents and legal terms into a context string."""
         if not retrieved_docs:
@@ -70,10 +136,13 @@ class LegalQAChain:
         context_parts = []
 
         # Separate articles and terms
-        articles = [doc for doc in retrieved_docs if doc["metadata"].get(
-            "type") != "legal_term"]
-        terms = [doc for doc in retrieved_docs if doc["metadata"].get(
-            "type") == "legal_term"]
+        articles = []
+        terms = []
+        for doc in retrieved_docs:
+            if doc["metadata"].get("type") == "legal_term":
+                terms.append(doc)
+            else:
+                articles.append(doc)
 
         # Add relevant articles
         if articles:
@@ -93,10 +162,16 @@ class LegalQAChain:
 
         return "\n".join(context_parts)
 
+    @staticmethod
+    def is_error_answer(answer: str) -> bool:
+        """Check whether an answer is one of run()'s error messages."""
+        return answer.startswith(ERROR_ANSWER_PREFIXES)
+
     def run(
         self,
         question: str,
-        metadata_filter: Optional[Dict[str, str]] = None
+        metadata_filter: Optional[Dict[str, str]] = None,
+        retrieved_docs: Optional[List[Dict]] = None
     ) -> str:
         """
         Run the QA chain to answer a question.
@@ -104,6 +179,8 @@ class LegalQAChain:
         Args:
             question: The question to answer
             metadata_filter: Optional metadata filters for document retrieval
+            retrieved_docs: Optional documents already retrieved for the
+                question; when given, the chain skips its own retrieval
 
         Returns:
             str: The generated answer
@@ -116,10 +193,29 @@ class LegalQAChain:
             raise ValueError("Question must be a non-empty string")
 
         try:
-            return self.chain.invoke({
-                "question": question,
-                "metadata_filter": metadata_filter
-            })
+            if self._cache_size <= 0:
+                return self.chain.invoke({
+                    "question": question,
+                    "metadata_filter": metadata_filter,
+                    "retrieved_docs": retrieved_docs
+                })
+
+            if retrieved_docs is None:
+                retrieved_docs = self._get_documents_cached(
+                    question, metadata_filter)
+            context = self.format_context(retrieved_docs)
+            key = (
+                hashlib.blake2b(context.encode("utf-8"), digest_size=16).digest(),
+                question
+            )
+            answer = self._get_cached(self._response_cache, key)
+            if answer is None:
+                answer = self.answer_chain.invoke({
+                    "context": context,
+                    "question": question
+                })
+                self._store_cached(self._response_cache, key, answer)
+            return answer
         except Exception as e:
             error_msg = str(e)
             if "API key" in error_msg.lower():
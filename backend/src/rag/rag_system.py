@@ -1,11 +1,10 @@
-import json
+import heapq
 import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Union
 import warnings
 
 import chromadb
-from chromadb.utils import embedding_functions
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
@@ -13,7 +12,9 @@ from langchain.schema import Document
 from langchain_core.language_models import BaseLanguageModel
 from sentence_transformers import SentenceTransformer
 import openai
-from .legal_terms import LegalTerminology
+import orjson
+from .embeddings import get_embedding_function
+from .legal_terms import get_legal_terminology
 from .qa_chain import LegalQAChain
 
 # Load environment variables
@@ -38,6 +39,12 @@ CHROMA_DB_DIR = os.path.join(os.path.dirname(
 os.makedirs(CHROMA_DB_DIR, exist_ok=True)
 
 
+def _term_distance(term: Dict) -> float:
+    """Sort key for legal terms; terms without a distance rank last."""
+    distance = term.get("distance")
+    return float("inf") if distance is None else distance
+
+
 class TurkishLegalRAG:
     """A flexible RAG system for Turkish legal text that can work with different LLMs."""
 
@@ -52,9 +59,9 @@ class TurkishLegalRAG:
         self.law_data = self._load_law_data(law_json_path)
 
         # Initialize embedding function with optional token
-        self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
+        self.embedding_function = get_embedding_function(
             model_name=embedding_model,
-            token=hf_token
+            hf_token=hf_token
         )
 
         # Initialize Chroma client with persistent storage
@@ -79,8 +86,8 @@ class TurkishLegalRAG:
         # Initialize legal terminology if path provided
         self.legal_terms = None
         if terms_json_path:
-            self.legal_terms = LegalTerminology(
-                terms_json_path=terms_json_path,
+            self.legal_terms = get_legal_terminology(
+                terms_json_path=str(terms_json_path),
                 embedding_model=embedding_model,
                 hf_token=hf_token
             )
@@ -91,12 +98,12 @@ class TurkishLegalRAG:
             raise FileNotFoundError(f"Law data file not found: {json_path}")
 
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(json_path, 'rb') as f:
+                data = orjson.loads(f.read())
             if not isinstance(data, dict):
                 raise ValueError("Invalid law data format")
             return data
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON format in law data: {str(e)}")
         except Exception as e:
             raise Exception(f"Error loading law data: {str(e)}")
@@ -107,52 +114,59 @@ class TurkishLegalRAG:
         ids = []
         metadatas = []
 
-        # Process each article (same as before)
+        # Process each article; book/part/chapter metadata is shared by every
+        # document in a chapter, so build it once per chapter
         for book in self.law_data['books']:
+            book_title = book['title']
             for part in book['parts']:
+                part_title = part['title']
                 for chapter in part['chapters']:
+                    location = {
+                        'book': book_title,
+                        'part': part_title,
+                        'chapter': chapter['title']
+                    }
                     for article in chapter['articles']:
+                        number = article['number']
+
                         # Create a document for the full article
-                        article_text = f"Article {article['number']}: {article['content']}"
-                        article_id = f"article_{article['number']}"
-
-                        documents.append(article_text)
-                        ids.append(article_id)
-                        metadatas.append({
-                            'type': 'article',
-                            'number': article['number'],
-                            'book': book['title'],
-                            'part': part['title'],
-                            'chapter': chapter['title']
-                        })
+                        documents.append(f"Article {number}: {article['content']}")
+                        ids.append(f"article_{number}")
+                        metadatas.append(
+                            {'type': 'article', 'number': number, **location})
 
                         # Create documents for key provisions
-                        if 'key_provisions' in article:
-                            for idx, provision in enumerate(article['key_provisions']):
-                                provision_id = f"provision_{article['number']}_{idx}"
-                                documents.append(provision)
-                                ids.append(provision_id)
-                                metadatas.append({
-                                    'type': 'provision',
-                                    'article_number': article['number'],
-                                    'provision_index': idx,
-                                    'book': book['title'],
-                                    'part': part['title'],
-                                    'chapter': chapter['title']
-                                })
-
-        # Add documents to the collection
-        self.collection.add(
-            documents=documents,
-            ids=ids,
-            metadatas=metadatas
-        )
+                        for idx, provision in enumerate(article.get('key_provisions', ())):
+                            documents.append(provision)
+                            ids.append(f"provision_{number}_{idx}")
+                            metadatas.append({
+                                'type': 'provision',
+                                'article_number': number,
+                                'provision_index': idx,
+                                **location
+                            })
+
+        # Add documents to the collection in batches so embeddings are
+        # computed and persisted progressively instead of all at once
+        batch_size = 256
+        for i in range(0, len(documents), batch_size):
+            end_idx = min(i + batch_size, len(documents))
+            self.collection.add(
+                documents=documents[i:end_idx],
+                ids=ids[i:end_idx],
+                metadatas=metadatas[i:end_idx]
+            )
+
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a query with the model shared by the law and terms collections."""
+        return self.embedding_function([query])[0]
 
     def retrieve(
         self,
         query: str,
         n_results: int = 5,
-        metadata_filter: Optional[Dict[str, str]] = None
+        metadata_filter: Optional[Dict[str, str]] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict]:
         """
         Retrieve relevant documents and legal terms for the given query.
@@ -161,13 +175,19 @@ class TurkishLegalRAG:
             query: The search query
             n_results: Number of results to retrieve
             metadata_filter: Optional metadata filters
+            query_embedding: Optional precomputed embedding of the query, to
+                avoid re-encoding it when the caller already has one
 
         Returns:
             List of relevant documents and terms
         """
+        # Encode the query once and reuse it for both collections
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
+
         # Get relevant law articles
         results = self.collection.query(
-            query_texts=[query],
+            query_embeddings=[query_embedding],
             n_results=n_results,
             where=metadata_filter
         )
@@ -184,29 +204,33 @@ class TurkishLegalRAG:
 
         # Get relevant legal terms if available
         if self.legal_terms:
-            # Get terms based on both query and retrieved articles
-            term_contexts = [query] + [doc["content"] for doc in documents]
+            # Get terms based on both query and retrieved articles: uncached
+            # article texts are encoded in one batch and all lookups go to
+            # the terms collection as a single query
+            contents = [doc["content"] for doc in documents]
+            embeddings = [query_embedding] + [None] * len(contents)
             all_terms = []
-            for context in term_contexts:
-                terms = self.legal_terms.get_relevant_terms(
-                    context, n_results=3)
+            for terms in self.legal_terms.get_relevant_terms_batch(
+                    [query] + contents, n_results=3, query_embeddings=embeddings):
                 all_terms.extend(terms)
 
-            # Remove duplicates and sort by relevance
-            seen_terms = set()
-            unique_terms = []
+            # Remove duplicates, keeping each term's closest match, and
+            # select the most relevant ones without sorting all candidates
+            best_terms: Dict[str, Dict] = {}
             for term in all_terms:
-                if term["term"] not in seen_terms:
-                    seen_terms.add(term["term"])
-                    unique_terms.append({
-                        "id": f"term_{len(unique_terms)}",
-                        "content": f"[TERM] {term['term']}\n[DEFINITION] {term['definition']}",
-                        "metadata": {"type": "legal_term", "term": term["term"]},
-                        "distance": term.get("distance")
-                    })
+                current = best_terms.get(term["term"])
+                if current is None or _term_distance(term) < _term_distance(current):
+                    best_terms[term["term"]] = term
 
             # Add most relevant terms to the results
-            documents.extend(unique_terms[:n_results])
+            for idx, term in enumerate(heapq.nsmallest(
+                    n_results, best_terms.values(), key=_term_distance)):
+                documents.append({
+                    "id": f"term_{idx}",
+                    "content": f"[TERM] {term['term']}\n[DEFINITION] {term['definition']}",
+                    "metadata": {"type": "legal_term", "term": term["term"]},
+                    "distance": term.get("distance")
+                })
 
         return documents
 
@@ -2,13 +2,13 @@
 Document retrieval functionality for the Turkish Legal RAG system.
 """
 
-import json
 import os
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
 import chromadb
 from chromadb.utils import embedding_functions
+import orjson
 
 from .embeddings import get_embedding_function
 
@@ -26,7 +26,9 @@ class DocumentRetriever:
         # Get embedding function
         hf_token = os.getenv("HUGGINGFACE_TOKEN")
         self.embedding_function = get_embedding_function(
-            embedding_model, hf_token)
+            model_name=embedding_model,
+            hf_token=hf_token
+        )
 
         # Initialize Chroma client and collection
         self.chroma_client = chromadb.Client()
@@ -51,12 +53,12 @@ class DocumentRetriever:
             raise FileNotFoundError(f"Law data file not found: {json_path}")
 
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(json_path, 'rb') as f:
+                data = orjson.loads(f.read())
             if not isinstance(data, dict):
                 raise ValueError("Invalid law data format")
             return data
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON format in law data: {str(e)}")
         except Exception as e:
             raise Exception(f"Error loading law data: {str(e)}")
@@ -67,45 +69,48 @@ class DocumentRetriever:
         ids = []
         metadatas = []
 
+        # Process each article; book/part/chapter metadata is shared by every
+        # document in a chapter, so build it once per chapter
         for book in self.law_data['books']:
+            book_title = book['title']
             for part in book['parts']:
+                part_title = part['title']
                 for chapter in part['chapters']:
+                    location = {
+                        'book': book_title,
+                        'part': part_title,
+                        'chapter': chapter['title']
+                    }
                     for article in chapter['articles']:
+                        number = article['number']
+
                         # Create a document for the full article
-                        article_text = f"Article {article['number']}: {article['content']}"
-                        article_id = f"article_{article['number']}"
-
-                        documents.append(article_text)
-                        ids.append(article_id)
-                        metadatas.append({
-                            'type': 'article',
-                            'number': article['number'],
-                            'book': book['title'],
-                            'part': part['title'],
-                            'chapter': chapter['title']
-                        })
+                        documents.append(f"Article {number}: {article['content']}")
+                        ids.append(f"article_{number}")
+                        metadatas.append(
+                            {'type': 'article', 'number': number, **location})
 
                         # Create documents for key provisions
-                        if 'key_provisions' in article:
-                            for idx, provision in enumerate(article['key_provisions']):
-                                provision_id = f"provision_{article['number']}_{idx}"
-                                documents.append(provision)
-                                ids.append(provision_id)
-                                metadatas.append({
-                                    'type': 'provision',
-                                    'article_number': article['number'],
-                                    'provision_index': idx,
-                                    'book': book['title'],
-                                    'part': part['title'],
-                                    'chapter': chapter['title']
-                                })
-
-        # Add documents to the collection
-        self.collection.add(
-            documents=documents,
-            ids=ids,
-            metadatas=metadatas
-        )
+                        for idx, provision in enumerate(article.get('key_provisions', ())):
+                            documents.append(provision)
+                            ids.append(f"provision_{number}_{idx}")
+                            metadatas.append({
+                                'type': 'provision',
+                                'article_number': number,
+                                'provision_index': idx,
+                                **location
+                            })
+
+        # Add documents to the collection in batches so embeddings are
+        # computed and persisted progressively instead of all at once
+        batch_size = 256
+        for i in range(0, len(documents), batch_size):
+            end_idx = min(i + batch_size, len(documents))
+            self.collection.add(
+                documents=documents[i:end_idx],
+                ids=ids[i:end_idx],
+                metadatas=metadatas[i:end_idx]
+            )
 
     def retrieve(self,
                  query: str,
@@ -155,8 +160,8 @@ class DocumentRetriever:
         context_parts = []
         for doc in retrieved_docs:
             if doc['metadata']['type'] == 'article':
-                context_parts.append(
-                    f"Article {doc['metadata']['number']}: {doc['content']}")
+                # Article documents are stored as "Article N: ..." already
+                context_parts.append(doc['content'])
             else:
                 context_parts.append(
                     f"From Article {doc['metadata']['article_number']}: {doc['content']}")
@@ -3,9 +3,13 @@ Helper functions for the Turkish Legal RAG system.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+# Resolved once at import; the project root never changes at runtime
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
 
 def ensure_directory(path: str) -> None:
     """Ensure a directory exists, create if it doesn't."""
@@ -14,16 +18,18 @@ def ensure_directory(path: str) -> None:
 
 def get_project_root() -> Path:
     """Get the project root directory."""
-    return Path(__file__).parent.parent.parent
+    return PROJECT_ROOT
 
 
+@lru_cache(maxsize=None)
 def get_data_dir() -> Path:
     """Get the data directory path."""
-    data_dir = get_project_root() / 'data'
+    data_dir = PROJECT_ROOT / 'data'
     ensure_directory(str(data_dir))
     return data_dir
 
 
+@lru_cache(maxsize=None)
 def get_vector_store_path() -> Path:
     """Get the vector store directory path."""
     vector_store_path = get_data_dir() / 'vector_store'
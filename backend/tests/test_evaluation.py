@@ -0,0 +1,239 @@
+"""
+Tests for the prompt evaluation metrics.
+"""
+
+import json
+import math
+import os
+
+import pytest
+
+from src.rag.prompts.evaluation import METRICS_VERSION, PromptEvaluator
+
+SECTIONS = ["SORU KAPSAMI", "İLGİLİ KANUN MADDELERİ", "HUKUKİ ANALİZ", "SONUÇ"]
+
+FULL_ANSWER = (
+    "SORU KAPSAMI:\nSoru taksir kavramını ele alıyor.\nKapsam dar.\n\n"
+    "İLGİLİ KANUN MADDELERİ:\nMadde 22 taksiri düzenler.\n\n"
+    "HUKUKİ ANALİZ:\nTaksirle işlenen suçlarda kusur esastır.\nKast aranmaz.\n\n"
+    "SONUÇ:\nFail taksirden sorumludur."
+)
+MISSING_SECTIONS_ANSWER = "SORU KAPSAMI:\nKapsam.\n\nSONUÇ:\nKısa sonuç."
+
+
+@pytest.fixture
+def evaluator(tmp_path):
+    return PromptEvaluator(output_dir=str(tmp_path))
+
+
+# Expected values below pin METRICS_VERSION 2; changing them means the
+# scoring rules changed and METRICS_VERSION must be bumped.
+
+def test_metrics_version_is_pinned():
+    assert METRICS_VERSION == 2
+
+
+def test_structure_score(evaluator):
+    """Sections with at least two lines before the next header earn the bonus."""
+    assert evaluator._evaluate_structure(FULL_ANSWER, SECTIONS) == pytest.approx(0.8333333333333334)
+    assert evaluator._evaluate_structure(
+        MISSING_SECTIONS_ANSWER, SECTIONS) == pytest.approx(0.3333333333333333)
+
+
+def test_structure_section_ends_at_next_expected_header(evaluator):
+    """A section no longer runs on to the next occurrence of the first section."""
+    answer = "SORU KAPSAMI:\nTek satır.\nİLGİLİ KANUN MADDELERİ:\nMadde 22."
+    # Version 1 credited SORU KAPSAMI with both lines up to the end (0.8333)
+    assert evaluator._evaluate_structure(answer, SECTIONS[:2]) == pytest.approx(0.6666666666666666)
+
+
+def test_structure_score_with_nested_section_names(evaluator):
+    """A section name contained in another is matched as its own header only."""
+    answer = "ANALİZ:\nBir.\nİki.\n\nHUKUKİ ANALİZ:\nÜç."
+    assert evaluator._evaluate_structure(
+        answer, ["HUKUKİ ANALİZ", "ANALİZ"]) == pytest.approx(0.8333333333333334)
+
+
+def test_section_completeness(evaluator):
+    """Section completeness across complexities."""
+    assert evaluator._evaluate_section_completeness(
+        FULL_ANSWER, "medium") == pytest.approx(0.2295833333333333)
+    # SORU KAPSAMI ends at SONUÇ even though the sections between are missing
+    assert evaluator._evaluate_section_completeness(
+        MISSING_SECTIONS_ANSWER, "low") == pytest.approx(0.018)
+
+
+def test_section_completeness_list_items(evaluator):
+    """Only the original list pattern ("-1.] item") earns the list bonus."""
+    answer = "SORU KAPSAMI:\n- taksir unsuru\n1. kast\n\nSONUÇ:\n-1.] madde metni"
+    assert evaluator._evaluate_section_completeness(
+        answer, "medium") == pytest.approx(0.09958333333333333)
+
+
+def test_evaluate_response_metrics(evaluator):
+    """All metrics for a structured answer."""
+    metrics = evaluator.evaluate_response(
+        "structured", "Taksir nedir?", FULL_ANSWER,
+        expected_structure=SECTIONS,
+        metadata={"complexity": "high", "expected_terms": ["taksir"]}
+    )
+    assert metrics == pytest.approx({
+        "length_score": 0.7233333333333334,
+        "structure_score": 0.8333333333333334,
+        "legal_reference_score": 0.5,
+        "term_usage_score": 1.0,
+        "formatting_score": 0.4,
+        "section_completeness": 0.2091111111111111,
+        "overall_score": 0.6208222222222224,
+    })
+
+
+def test_results_record_metrics_version(tmp_path, evaluator):
+    """New results carry the current version; older saved files load as 1."""
+    evaluator.add_result("basic", "q", "a", {"overall_score": 0.5})
+    assert evaluator.results[0].metrics_version == METRICS_VERSION
+
+    with open(tmp_path / "old.json", "w", encoding="utf-8") as f:
+        json.dump([{"prompt_name": "basic", "question": "q", "answer": "a",
+                    "metrics": {"overall_score": 0.5}, "metadata": {},
+                    "timestamp": "2024-01-01T00:00:00"}], f)
+    evaluator.load_results("old.json")
+    assert evaluator.results[0].metrics_version == 1
+
+
+def test_add_result_accepts_partial_metrics(evaluator):
+    """Results without the column metrics are stored and skipped in summaries."""
+    evaluator.add_result("custom", "q1", "a1", {"length_score": 0.5})
+    evaluator.add_result("basic", "q2", "a2", {"overall_score": 0.4})
+    evaluator.add_result("basic", "q3", "a3", {"term_usage_score": 1.0})
+
+    columns = evaluator.get_columns()
+    assert columns["prompt_name"] == ["custom", "basic", "basic"]
+    assert columns["overall_score"][1] == 0.4
+    assert math.isnan(columns["overall_score"][0])
+    assert columns["term_usage_score"][2] == 1.0
+
+    summary = evaluator.get_summary()
+    assert summary["total_evaluations"] == 3
+    assert summary["prompts_evaluated"] == 2
+    assert summary["average_scores"] == {"basic": pytest.approx(0.4)}
+    assert summary["best_performing_prompt"] == "basic"
+
+
+def test_summary_averages_in_first_appearance_order(evaluator):
+    """Per-prompt averages keep the order prompts were first evaluated in."""
+    for prompt_name, score in [("multi_step", 0.2), ("basic", 0.6),
+                               ("multi_step", 0.4), ("structured", 0.5)]:
+        evaluator.add_result(prompt_name, "q", "a", {"overall_score": score})
+
+    summary = evaluator.get_summary()
+    assert list(summary["average_scores"]) == ["multi_step", "basic", "structured"]
+    assert summary["average_scores"]["multi_step"] == pytest.approx(0.3)
+    assert summary["best_performing_prompt"] == "basic"
+
+
+def test_streamed_results_are_written_per_record(tmp_path):
+    """Each streamed result reaches the JSONL file before the evaluator closes."""
+    with PromptEvaluator(output_dir=str(tmp_path), stream_results=True) as evaluator:
+        evaluator.add_result("basic", "q", "a", {"overall_score": 0.5})
+        with open(evaluator.stream_path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert [r["prompt_name"] for r in records] == ["basic"]
+
+    assert evaluator._stream is None
+
+
+def test_add_result_uses_given_timestamp(evaluator):
+    """An explicit timestamp is kept; otherwise each result gets its own."""
+    evaluator.add_result("basic", "q", "a", {"overall_score": 0.5},
+                         timestamp="2024-01-01T00:00:00")
+    evaluator.add_result("basic", "q", "a", {"overall_score": 0.5})
+
+    assert evaluator.results[0].timestamp == "2024-01-01T00:00:00"
+    assert evaluator.results[1].timestamp != "2024-01-01T00:00:00"
+
+
+def test_metrics_cache_hits_and_clear(evaluator):
+    """Repeated responses are served from the cache until it is cleared."""
+    first = evaluator.evaluate_response("basic", "q", FULL_ANSWER, SECTIONS)
+    first["overall_score"] = -1.0  # callers get a copy, not the cached dict
+
+    evaluator._evaluate_length = lambda answer: 0.0
+    assert evaluator.evaluate_response(
+        "basic", "q", FULL_ANSWER, SECTIONS)["length_score"] == pytest.approx(0.7233333333333334)
+
+    evaluator.clear_cache()
+    assert evaluator.evaluate_response(
+        "basic", "q", FULL_ANSWER, SECTIONS)["length_score"] == 0.0
+
+
+def test_metrics_cache_is_bounded(tmp_path):
+    """The least recently used metrics are evicted past metrics_cache_size."""
+    evaluator = PromptEvaluator(output_dir=str(tmp_path), metrics_cache_size=2)
+    for answer in ("a", "b", "a", "c"):
+        evaluator.evaluate_response("basic", "q", answer)
+
+    assert len(evaluator._metrics_cache) == 2
+    evaluator._evaluate_length = lambda answer: 0.0
+    assert evaluator.evaluate_response("basic", "q", "a")["length_score"] > 0.0
+    assert evaluator.evaluate_response("basic", "q", "b")["length_score"] == 0.0
+
+
+def test_evaluate_batch_matches_evaluate_response(tmp_path, evaluator):
+    """Batch evaluation in worker processes gives the same metrics in order."""
+    cases = [
+        {"answer": FULL_ANSWER, "expected_structure": SECTIONS,
+         "metadata": {"complexity": "high", "expected_terms": ["taksir"]}},
+        {"answer": MISSING_SECTIONS_ANSWER, "expected_structure": SECTIONS},
+        {"answer": "Kısa yanıt (Madde 21)", "metadata": {"complexity": "low"}},
+        {"answer": FULL_ANSWER, "expected_structure": SECTIONS,
+         "metadata": {"complexity": "high", "expected_terms": ["taksir"]}},
+    ]
+    # One case is already cached in the parent process
+    evaluator.evaluate_response("basic", "q", **cases[1])
+
+    batch = evaluator.evaluate_batch(cases, max_workers=2, chunksize=1)
+
+    reference = PromptEvaluator(output_dir=str(tmp_path / "reference"))
+    assert batch == [reference.evaluate_response("basic", "q", **case) for case in cases]
+
+
+def add_sample_results(evaluator):
+    evaluator.add_result("basic", "Taksir nedir?", "Taksir ...",
+                         {"overall_score": 0.6, "term_usage_score": 0.5,
+                          "structure_score": 1.0},
+                         metadata={"complexity": "low"})
+    evaluator.add_result("structured", "Kast nedir?", "Kast ...",
+                         {"overall_score": 0.4},
+                         metadata={"complexity": "high", "expected_terms": ["kast"]})
+
+
+def test_save_and_load_round_trip(tmp_path, evaluator):
+    """Saved JSON results load back unchanged, with rebuilt columns."""
+    add_sample_results(evaluator)
+    evaluator.save_results("results.json")
+
+    with open(tmp_path / "results.json", encoding="utf-8") as f:
+        assert len(json.load(f)) == 2
+
+    loaded = PromptEvaluator(output_dir=str(tmp_path))
+    loaded.load_results("results.json")
+    assert loaded.results == evaluator.results
+    assert loaded.get_summary()["average_scores"] == evaluator.get_summary()["average_scores"]
+
+
+def test_save_empty_results_is_valid_json(tmp_path, evaluator):
+    evaluator.save_results("empty.json")
+    with open(tmp_path / "empty.json", encoding="utf-8") as f:
+        assert json.load(f) == []
+
+
+def test_load_streamed_jsonl_results(tmp_path):
+    """Results streamed to JSONL load back like a saved JSON file."""
+    with PromptEvaluator(output_dir=str(tmp_path), stream_results=True) as evaluator:
+        add_sample_results(evaluator)
+
+    loaded = PromptEvaluator(output_dir=str(tmp_path))
+    loaded.load_results(os.path.basename(evaluator.stream_path))
+    assert loaded.results == evaluator.results
+    assert loaded.get_columns()["complexity"] == ["low", "high"]
@@ -0,0 +1,185 @@
+"""
+Tests for legal terminology collection reuse and batched term lookups.
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from chromadb.errors import InvalidCollectionException  # noqa: E402
+from src.rag import legal_terms  # noqa: E402
+from src.rag.legal_terms import LegalTerminology  # noqa: E402
+
+
+class FakeEmbeddingFunction:
+    """Embeds each text as its length and records every batch it encodes."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+class FakeCollection:
+    """In-memory stand-in for a Chroma collection."""
+
+    def __init__(self, metadata):
+        self.metadata = metadata
+        self.ids = []
+        self.documents = []
+        self.metadatas = []
+        self.queries = []
+
+    def add(self, documents, ids, metadatas):
+        self.ids.extend(ids)
+        self.documents.extend(documents)
+        self.metadatas.extend(metadatas)
+
+    def query(self, query_embeddings, n_results):
+        """Return the first n_results terms per query, at the query's distance."""
+        self.queries.append(query_embeddings)
+        return {
+            "documents": [self.documents[:n_results] for _ in query_embeddings],
+            "metadatas": [self.metadatas[:n_results] for _ in query_embeddings],
+            "distances": [[embedding[0]] * len(self.documents[:n_results])
+                          for embedding in query_embeddings],
+        }
+
+
+class FakeClient:
+    """In-memory stand-in for chromadb.PersistentClient."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def get_collection(self, name, embedding_function=None):
+        if name not in self.store:
+            raise InvalidCollectionException(f"Collection {name} does not exist.")
+        return self.store[name]
+
+    def delete_collection(self, name):
+        del self.store[name]
+
+    def create_collection(self, name, embedding_function=None, metadata=None):
+        self.store[name] = FakeCollection(metadata)
+        return self.store[name]
+
+
+@pytest.fixture
+def chroma_store(monkeypatch):
+    """Collections shared by every client created during a test."""
+    store = {}
+    monkeypatch.setattr(legal_terms.chromadb, "PersistentClient",
+                        lambda path: FakeClient(store))
+    monkeypatch.setattr(legal_terms, "get_embedding_function",
+                        lambda **kwargs: FakeEmbeddingFunction())
+    return store
+
+
+def write_terms(path, terms):
+    path.write_text(json.dumps(terms, ensure_ascii=False), encoding="utf-8")
+
+
+def test_reuses_collection_with_matching_fingerprint(tmp_path, chroma_store):
+    """An unchanged terms file reuses the stored collection."""
+    terms = {"taksir": "Dikkat ve özen yükümlülüğüne aykırılık", "kast": "Bilerek ve isteyerek"}
+    terms_path = tmp_path / "terms.json"
+    write_terms(terms_path, terms)
+
+    first = LegalTerminology(str(terms_path), collection_name="terms")
+    second = LegalTerminology(str(terms_path), collection_name="terms")
+
+    assert second.collection is first.collection
+    assert len(second.collection.ids) == len(terms)
+    # Reused collections still expose the terms, loaded on first access
+    assert second.terms_data == terms
+
+
+def test_rebuilds_collection_when_terms_change(tmp_path, chroma_store):
+    """A changed terms file replaces the stale collection."""
+    terms_path = tmp_path / "terms.json"
+    write_terms(terms_path, {"taksir": "Dikkat ve özen yükümlülüğüne aykırılık"})
+    first = LegalTerminology(str(terms_path), collection_name="terms")
+
+    new_terms = {"kast": "Bilerek ve isteyerek", "rıza": "Hakkın sahibinin onayı"}
+    write_terms(terms_path, new_terms)
+    second = LegalTerminology(str(terms_path), collection_name="terms")
+
+    assert second.collection is not first.collection
+    assert chroma_store["terms"] is second.collection
+    assert (second.collection.metadata["terms_fingerprint"]
+            != first.collection.metadata["terms_fingerprint"])
+    assert len(second.collection.ids) == len(new_terms)
+    assert second.terms_data == new_terms
+
+
+def test_rebuilds_collection_when_model_changes(tmp_path, chroma_store):
+    """The embedding model is part of the fingerprint."""
+    terms_path = tmp_path / "terms.json"
+    write_terms(terms_path, {"kast": "Bilerek ve isteyerek"})
+    first = LegalTerminology(str(terms_path), collection_name="terms",
+                             embedding_model="model-a")
+    second = LegalTerminology(str(terms_path), collection_name="terms",
+                              embedding_model="model-b")
+
+    assert second.collection is not first.collection
+
+
+def make_terminology(tmp_path, cache_size=1024):
+    terms_path = tmp_path / "terms.json"
+    write_terms(terms_path, {"taksir": "Dikkat ve özen yükümlülüğüne aykırılık"})
+    return LegalTerminology(str(terms_path), collection_name="terms",
+                            cache_size=cache_size)
+
+
+def distances(batch):
+    return [terms[0]["distance"] for terms in batch]
+
+
+def test_batch_lookup_uses_one_query_for_uncached_contexts(tmp_path, chroma_store):
+    """Uncached contexts are encoded together and sent as a single query."""
+    terminology = make_terminology(tmp_path)
+    embedding_function = terminology.embedding_function
+
+    batch = terminology.get_relevant_terms_batch(
+        ["a", "bb", "ccc"], n_results=1, query_embeddings=[None, [9.0], None])
+
+    assert embedding_function.calls == [["a", "ccc"]]
+    assert terminology.collection.queries == [[[1.0], [9.0], [3.0]]]
+    assert distances(batch) == [1.0, 9.0, 3.0]
+    assert batch[0][0] == {"term": "taksir",
+                           "definition": "Dikkat ve özen yükümlülüğüne aykırılık",
+                           "distance": 1.0}
+
+
+def test_batch_lookup_mixes_cached_and_new_results_in_order(tmp_path, chroma_store):
+    """Cached contexts skip the query; results keep the input order."""
+    terminology = make_terminology(tmp_path)
+    terminology.get_relevant_terms_batch(["bb"], n_results=1)
+
+    batch = terminology.get_relevant_terms_batch(["a", "bb", "ccc"], n_results=1)
+
+    assert terminology.collection.queries[-1] == [[1.0], [3.0]]
+    assert distances(batch) == [1.0, 2.0, 3.0]
+
+    # A fully cached batch makes no query at all
+    terminology.get_relevant_terms_batch(["ccc", "a"], n_results=1)
+    assert len(terminology.collection.queries) == 2
+
+
+def test_batch_lookup_evicts_least_recently_used(tmp_path, chroma_store):
+    """The terms cache holds at most cache_size lookups."""
+    terminology = make_terminology(tmp_path, cache_size=2)
+
+    terminology.get_relevant_terms_batch(["a", "bb"], n_results=1)
+    terminology.get_relevant_terms_batch(["a"], n_results=1)
+    terminology.get_relevant_terms_batch(["ccc"], n_results=1)
+    assert len(terminology.collection.queries) == 2
+
+    # "bb" was evicted when "ccc" was added; "a" is still cached
+    terminology.get_relevant_terms_batch(["a", "bb"], n_results=1)
+    assert terminology.collection.queries[-1] == [[2.0]]
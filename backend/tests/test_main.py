@@ -0,0 +1,101 @@
+"""
+Tests for the /health and /question responses during service startup.
+"""
+
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+QUESTION = {"question": "Taksir nedir?"}
+
+
+class FakeQAService:
+    """Answers every question without touching the RAG stack."""
+
+    def warm_up(self):
+        pass
+
+    def shutdown(self):
+        pass
+
+    async def get_answer(self, question, metadata_filter=None, n_results=5):
+        return {"answer": "Yanıt", "confidence_score": 0.8,
+                "sources": [], "processing_time": 0.0}
+
+
+@pytest.fixture(autouse=True)
+def reset_app_state():
+    """Each test starts from a freshly created app state."""
+    main.app.state.is_initialized = False
+    main.app.state.init_error = None
+    main.app.state.qa_service = None
+    yield
+
+
+def start(client):
+    """Wait for the background QA service initialization to finish."""
+    async def wait():
+        await main.app.state.init_task
+    client.portal.call(wait)
+
+
+def test_initializing(monkeypatch):
+    """While the service is loading, /health and /question return 503."""
+    release = threading.Event()
+
+    def slow_service():
+        release.wait()
+        return FakeQAService()
+
+    monkeypatch.setattr(main, "get_qa_service", slow_service)
+    with TestClient(main.app) as client:
+        try:
+            response = client.get("/health")
+            assert response.status_code == 503
+            assert response.json() == {"status": "initializing"}
+
+            response = client.post("/api/v1/question", json=QUESTION)
+            assert response.status_code == 503
+            assert response.json() == {"detail": "Service is still initializing"}
+        finally:
+            release.set()
+            start(client)
+
+
+def test_initialization_failed(monkeypatch):
+    """A failed startup is reported as 500 instead of initializing forever."""
+    def broken_service():
+        raise RuntimeError("collection missing")
+
+    monkeypatch.setattr(main, "get_qa_service", broken_service)
+    with TestClient(main.app) as client:
+        start(client)
+
+        response = client.get("/health")
+        assert response.status_code == 500
+        assert response.json() == {"status": "initialization_failed",
+                                   "detail": "collection missing"}
+
+        response = client.post("/api/v1/question", json=QUESTION)
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Service initialization failed"}
+
+
+def test_ready(monkeypatch):
+    """Once the service is built, /health is healthy and questions are answered."""
+    monkeypatch.setattr(main, "get_qa_service", FakeQAService)
+    with TestClient(main.app) as client:
+        start(client)
+
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.json() == {"status": "healthy"}
+        # The prebuilt response is served as-is on every probe
+        assert client.get("/health").content == response.content
+
+        response = client.post("/api/v1/question", json=QUESTION)
+        assert response.status_code == 200
+        assert response.json()["answer"] == "Yanıt"
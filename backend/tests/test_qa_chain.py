@@ -0,0 +1,116 @@
+"""
+Tests for the LegalQAChain retrieval and answer caches.
+"""
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.runnables import RunnableLambda  # noqa: E402
+from src.rag.qa_chain import LegalQAChain  # noqa: E402
+
+DOCS = [{
+    "content": "Kanunun açık olarak belirttiği hâller dışında, taksirli fiiller cezalandırılmaz.",
+    "metadata": {"type": "article", "number": 22}
+}]
+
+
+class FakeRAGSystem:
+    """Returns fixed documents and counts retrievals."""
+
+    def __init__(self):
+        self.calls = []
+
+    def retrieve(self, query, n_results=5, metadata_filter=None):
+        self.calls.append((query, metadata_filter))
+        return DOCS
+
+
+class FakeLLM:
+    """Counts calls and raises the queued errors before answering."""
+
+    def __init__(self, errors=()):
+        self.calls = 0
+        self.errors = list(errors)
+
+    def __call__(self, prompt_value):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return f"Yanıt {self.calls}"
+
+
+def make_chain(cache_size=0, errors=()):
+    rag_system = FakeRAGSystem()
+    llm = FakeLLM(errors)
+    chain = LegalQAChain(rag_system, RunnableLambda(llm), cache_size=cache_size)
+    return chain, rag_system, llm
+
+
+def test_caching_is_off_by_default():
+    """Without a cache size every run retrieves and calls the LLM."""
+    chain, rag_system, llm = make_chain()
+
+    assert chain.run("Taksir nedir?") == "Yanıt 1"
+    assert chain.run("Taksir nedir?") == "Yanıt 2"
+    assert len(rag_system.calls) == 2
+    assert llm.calls == 2
+
+
+def test_repeated_question_hits_both_caches():
+    """A repeated question and filter reuses the documents and the answer."""
+    chain, rag_system, llm = make_chain(cache_size=8)
+
+    first = chain.run("Taksir nedir?", metadata_filter={"book": "BİRİNCİ KİTAP", "type": "article"})
+    second = chain.run("Taksir nedir?", metadata_filter={"type": "article", "book": "BİRİNCİ KİTAP"})
+
+    assert first == second == "Yanıt 1"
+    assert len(rag_system.calls) == 1
+    assert llm.calls == 1
+
+
+def test_different_filter_retrieves_again():
+    """The metadata filter is part of the retrieval key."""
+    chain, rag_system, llm = make_chain(cache_size=8)
+
+    chain.run("Taksir nedir?")
+    chain.run("Taksir nedir?", metadata_filter={"type": "article"})
+
+    assert len(rag_system.calls) == 2
+    # Same documents give the same context, so the answer is reused
+    assert llm.calls == 1
+
+
+def test_error_answers_are_not_cached():
+    """A failed LLM call is retried on the next run."""
+    chain, rag_system, llm = make_chain(
+        cache_size=8, errors=[RuntimeError("Rate limit reached")])
+
+    error_answer = chain.run("Taksir nedir?")
+    assert LegalQAChain.is_error_answer(error_answer)
+
+    assert chain.run("Taksir nedir?") == "Yanıt 2"
+    assert llm.calls == 2
+
+
+def test_invalidate_cache_drops_retrievals_and_answers():
+    """After invalidation the chain retrieves and generates again."""
+    chain, rag_system, llm = make_chain(cache_size=8)
+
+    chain.run("Taksir nedir?")
+    chain.invalidate_cache()
+    assert chain.run("Taksir nedir?") == "Yanıt 2"
+
+    assert len(rag_system.calls) == 2
+    assert llm.calls == 2
+
+
+def test_least_recently_used_entries_are_evicted():
+    """The caches hold at most cache_size entries."""
+    chain, rag_system, llm = make_chain(cache_size=1)
+
+    chain.run("Taksir nedir?")
+    chain.run("Kast nedir?")
+    chain.run("Taksir nedir?")
+
+    assert len(rag_system.calls) == 3
@@ -0,0 +1,128 @@
+"""
+Tests for QAService retrieval sizing and the answer cache.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.runnables import RunnableLambda  # noqa: E402
+from app.core.config import clear_settings_cache  # noqa: E402
+from app.services.qa_service import QAService  # noqa: E402
+from src.rag.qa_chain import LegalQAChain  # noqa: E402
+
+
+class FakeRAGSystem:
+    """Returns n_results articles followed by n_results legal terms."""
+
+    def __init__(self):
+        self.calls = []
+
+    def retrieve(self, query, n_results=5, metadata_filter=None):
+        self.calls.append(n_results)
+        articles = [{"content": f"Madde metni {i}",
+                     "metadata": {"type": "article", "number": i}}
+                    for i in range(1, n_results + 1)]
+        terms = [{"content": f"[TERM] terim {i}",
+                  "metadata": {"type": "legal_term", "term": f"terim {i}"}}
+                 for i in range(1, n_results + 1)]
+        return articles + terms
+
+
+class FakeLLM:
+    """Records the prompts it is called with and raises the queued errors."""
+
+    def __init__(self, errors=()):
+        self.prompts = []
+        self.errors = list(errors)
+
+    def __call__(self, prompt_value):
+        self.prompts.append(prompt_value.to_string())
+        if self.errors:
+            raise self.errors.pop(0)
+        return f"Yanıt {len(self.prompts)}"
+
+
+def make_service(chain_n_results=5, errors=()):
+    rag_system = FakeRAGSystem()
+    llm = FakeLLM(errors)
+    qa_chain = LegalQAChain(rag_system, RunnableLambda(llm), n_results=chain_n_results)
+    return QAService(rag_system=rag_system, qa_chain=qa_chain), rag_system, llm
+
+
+@pytest.fixture
+def answer_cache_size(monkeypatch):
+    """Settings re-read with a two-entry answer cache."""
+    monkeypatch.setenv("ANSWER_CACHE_SIZE", "2")
+    clear_settings_cache()
+    yield 2
+    clear_settings_cache()
+
+
+def ask(service, question="Taksir nedir?", **kwargs):
+    return asyncio.run(service.get_answer(question, **kwargs))
+
+
+@pytest.mark.parametrize("n_results", [1, 5, 10])
+def test_n_results_sizes_sources_not_chain_context(n_results):
+    """One retrieval serves both; the chain context stays at its own size."""
+    service, rag_system, llm = make_service(chain_n_results=5)
+
+    result = ask(service, n_results=n_results)
+
+    assert rag_system.calls == [max(n_results, 5)]
+    types = [doc["metadata"]["type"] for doc in result["sources"]]
+    assert types == ["article"] * n_results + ["legal_term"] * n_results
+
+    prompt = llm.prompts[0]
+    assert "Madde 5:" in prompt and "Madde 6:" not in prompt
+    assert "terim 5" in prompt and "terim 6" not in prompt
+
+
+def test_normalized_question_hits_answer_cache():
+    """Case and surrounding whitespace do not defeat the answer cache."""
+    service, rag_system, llm = make_service()
+
+    first = ask(service, "Taksir nedir?")
+    second = ask(service, "  TAKSIR NEDIR? ")
+
+    assert second["answer"] == first["answer"] == "Yanıt 1"
+    assert len(rag_system.calls) == 1
+    assert len(llm.prompts) == 1
+
+
+def test_error_answers_are_not_cached():
+    """A failed LLM call is retried on the next request."""
+    service, rag_system, llm = make_service(errors=[RuntimeError("Rate limit reached")])
+
+    assert LegalQAChain.is_error_answer(ask(service)["answer"])
+    assert ask(service)["answer"] == "Yanıt 2"
+    assert len(rag_system.calls) == 2
+
+
+def test_answer_cache_is_bounded(answer_cache_size):
+    """The least recently used answers are evicted past ANSWER_CACHE_SIZE."""
+    service, rag_system, llm = make_service()
+
+    for question in ("Taksir nedir?", "Kast nedir?", "Taksir nedir?", "Rıza nedir?"):
+        ask(service, question)
+    assert len(service._answer_cache) == answer_cache_size
+
+    # Kast was the least recently used entry when Rıza was added
+    ask(service, "Taksir nedir?")
+    ask(service, "Kast nedir?")
+    assert len(llm.prompts) == 4
+
+
+def test_filter_and_n_results_are_part_of_the_key():
+    """A different metadata_filter or n_results misses the answer cache."""
+    service, rag_system, llm = make_service()
+
+    ask(service)
+    ask(service, metadata_filter={"type": "article"})
+    ask(service, n_results=3)
+    ask(service, metadata_filter={"type": "article"})
+
+    assert len(llm.prompts) == 3